@@ -1,13 +1,16 @@
+import atexit
 import logging
 import os
 
 from dotenv import load_dotenv
 from flask import Flask, jsonify
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import Queue
 
 from app.constants import ONE_MB
 from app.exceptions.api_errors import APIError
 from app.exceptions.config_errors import ConfigError
+from app.utils.json_provider import ORJSONProvider
 
 load_dotenv()
 
@@ -29,14 +32,30 @@ file_handler.setFormatter(
     logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
 
+log_queue = Queue(-1)
+queue_handler = QueueHandler(log_queue)
+log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger(__name__)
-logger.addHandler(file_handler)
+logger.addHandler(queue_handler)
+
+def log_directly_after_fork():
+    """Forked children (e.g. RQ work horses) have no listener thread, so write to the file directly"""
+    logger.removeHandler(queue_handler)
+    logger.addHandler(file_handler)
+
+os.register_at_fork(after_in_child=log_directly_after_fork)
+
+# Blueprints import `logger` from this package, so they are loaded once it exists
+from app.api.calculate_tax_routes import calculate_tax_bp  # noqa: E402
+from app.api.cache_routes import cache_bp  # noqa: E402
 
 def create_app():
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     
-    from app.api.calculate_tax_routes import calculate_tax_bp
-    from app.api.cache_routes import cache_bp
     app.register_blueprint(calculate_tax_bp)
     app.register_blueprint(cache_bp)
     
@@ -63,7 +82,7 @@ def create_app():
         return jsonify({"error": str(error)}), error.status_code
 
     @app.errorhandler(ConfigError)
-    def custom_api_error(error):
+    def custom_config_error(error):
         logger.error(f"Configuration error: {str(error)}", exc_info=True)
         return jsonify({"error": "Server configuration error"}), error.status_code
     
@@ -30,9 +30,7 @@ def clear_cache():
 def clear_year_cache(year: int):
     """Clear cache for specific tax year"""
     try:
-        cache_key = TaxCalculator.get_cache_key(year)
-        if cache_key in tax_brackets_cache:
-            del tax_brackets_cache[cache_key]
+        del tax_brackets_cache[TaxCalculator.get_cache_key(year)]
         return jsonify({"message": f"Cache cleared for year {year}"}), 200
 
     except Exception as e:
@@ -1,10 +1,13 @@
+import functools
+
 from flask import Blueprint, request, jsonify
-from redis import Redis
 from rq import Queue
 from rq.job import Job
 
 from app import logger
 from app.configurations import config
+from app.core.cache import LRUCache
+from app.core.connections import get_redis_conn
 from app.core.tax_calculator import TaxCalculator
 from app.core.worker import process_tax_calculations
 from app.constants import DEFAULT_YEAR
@@ -13,11 +16,21 @@ from app.decorators.timing import timing
 from app.exceptions.api_errors import ValidationError
 from app.utils.validators import validate_salary, validate_year
 
+FIVE_MINUTES_IN_SECONDS = 300
+JOB_STATUS_RATE_LIMIT_REQUESTS = 5
+JOB_STATUS_RATE_LIMIT_WINDOW_IN_SECONDS = 1
+# Larger batch results are read back from Redis on every poll rather than held in each process
+MAX_CACHED_JOB_RESULTS = 100
+
 calculate_tax_bp = Blueprint('calculate_tax', __name__)
 tax_calculator = TaxCalculator()
 
-redis_conn = Redis.from_url(config.get_redis_url())
-tax_queue = Queue('tax_calculations', connection=redis_conn)
+finished_jobs_cache = LRUCache(capacity=1000, ttl_in_seconds=FIVE_MINUTES_IN_SECONDS)
+
+@functools.cache
+def get_tax_queue() -> Queue:
+    """Create the batch calculation queue on first use, so importing the routes does not require REDIS_URL"""
+    return Queue('tax_calculations', connection=get_redis_conn())
 
 @calculate_tax_bp.route('/calculate-tax', methods=['GET'])
 @rate_limit()
@@ -80,7 +93,7 @@ def calculate_tax_batch():
     if not webhook_url:
         raise ValidationError("webhook_url is required")
     
-    job = tax_queue.enqueue(process_tax_calculations, calculations, webhook_url)
+    job = get_tax_queue().enqueue(process_tax_calculations, calculations, webhook_url)
     
     return jsonify({
         "message": "Tax calculations queued successfully",
@@ -88,31 +101,40 @@ def calculate_tax_batch():
     }), 202
 
 @calculate_tax_bp.route('/calculate-tax/<job_id>', methods=['GET'])
-@rate_limit(5, 1)
+@rate_limit(JOB_STATUS_RATE_LIMIT_REQUESTS, JOB_STATUS_RATE_LIMIT_WINDOW_IN_SECONDS)
 @timing('get:/calculate-tax/<job_id>')
 def get_job_status(job_id: str):
     """Get the status and result of a batch tax calculation job"""
     try:
+        cached_response = finished_jobs_cache.get(job_id)
+        if cached_response is not None:
+            return jsonify(cached_response), 200
+
         try:
-            job = Job.fetch(job_id, connection=redis_conn)
+            job = Job.fetch(job_id, connection=get_redis_conn())
         except Exception as e:
             logger.error(f"Error fetching job {job_id}: {str(e)}")
             return jsonify({
                 "error": f"Job not found or error occurred: {str(e)}"
             }), 404
-        job_status = job.get_status(refresh=True)
+        job_status = job.get_status(refresh=False)
 
         match job_status:
             case "finished":
-                return jsonify({
+                response = {
                     "status": "finished",
                     "result": job.result
-                }), 200
+                }
+                if len(job.result or ()) <= MAX_CACHED_JOB_RESULTS:
+                    finished_jobs_cache.put(job_id, response)
+                return jsonify(response), 200
             case "failed":
-                return jsonify({
+                response = {
                     "status": "failed",
                     "error": str(job.exc_info)
-                }), 200
+                }
+                finished_jobs_cache.put(job_id, response)
+                return jsonify(response), 200
             case _:
                 return jsonify({
                     "status": job_status
@@ -1,32 +1,42 @@
 import os
 
+from dataclasses import dataclass
+from typing import Optional
+
 from app.exceptions.config_errors import MissingEnvironmentVariable
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Central configuration management"""
+    """Central configuration management, read from the environment once at startup"""
+    admin_api_key: Optional[str]
+    redis_url: Optional[str]
+    api_url: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Snapshot the configuration from the current environment"""
+        return cls(
+            admin_api_key=os.getenv('ADMIN_API_KEY'),
+            redis_url=os.getenv('REDIS_URL'),
+            api_url=os.getenv('API_URL')
+        )
     
-    @staticmethod
-    def get_admin_api_key():
+    def get_admin_api_key(self):
         """Get the admin API key"""
-        api_key = os.getenv('ADMIN_API_KEY')
-        if not api_key:
+        if not self.admin_api_key:
             raise MissingEnvironmentVariable('ADMIN_API_KEY')
-        return api_key
+        return self.admin_api_key
     
-    @staticmethod
-    def get_redis_url():
+    def get_redis_url(self):
         """Get Redis URL"""
-        redis_url = os.getenv('REDIS_URL')
-        if not redis_url:
+        if not self.redis_url:
             raise MissingEnvironmentVariable('REDIS_URL')
-        return redis_url
+        return self.redis_url
     
-    @staticmethod
-    def get_api_url():
+    def get_api_url(self):
         """Get API URL"""
-        api_url = os.getenv('API_URL')
-        if not api_url:
+        if not self.api_url:
             raise MissingEnvironmentVariable('API_URL')
-        return api_url
+        return self.api_url
 
-config = Config()
+config = Config.from_env()
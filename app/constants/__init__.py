@@ -1,2 +1,4 @@
 DEFAULT_YEAR = 2023
+MIN_SUPPORTED_YEAR = 2019
+MAX_SUPPORTED_YEAR = 2023
 ONE_MB = 1024 * 1024
\ No newline at end of file
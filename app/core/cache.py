@@ -1,6 +1,12 @@
+import json
+import threading
+import time
+
 from collections import OrderedDict
-from datetime import datetime
-from typing import TypeVar, Generic, Optional, Hashable
+from redis import Redis, RedisError
+from typing import Any, Callable, TypeVar, Generic, Optional, Hashable
+
+from app import logger
 
 K = TypeVar('K', bound=Hashable)
 V = TypeVar('V')
@@ -9,11 +15,16 @@ class LRUCache(Generic[K, V]):
     """
     In-memory cache implementation using OrderedDict.
     Supports any hashable type as key and any type as value.
+    Expiry times are read from the injectable clock, which defaults to time.monotonic.
+    Access is guarded by a lock, so one instance can be shared across request threads.
     """
-    def __init__(self, capacity: int = 100, ttl_in_seconds: int = 3600):
-        self.cache: OrderedDict[K, tuple[V, float]] = OrderedDict()
+    def __init__(self, capacity: int = 100, ttl_in_seconds: int = 3600, clock: Callable[[], float] = time.monotonic):
+        self.cache: OrderedDict[K, V] = OrderedDict()
+        self.expiries: dict[K, float] = {}
         self.capacity = capacity
         self.ttl_in_seconds = ttl_in_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
 
     def __contains__(self, key: K) -> bool:
         """Support 'in' operator"""
@@ -21,27 +32,92 @@ class LRUCache(Generic[K, V]):
 
     def __delitem__(self, key: K) -> None:
         """Support delete operation"""
-        if key in self.cache:
-            del self.cache[key]
+        with self.lock:
+            if key in self.cache:
+                del self.cache[key]
+                del self.expiries[key]
 
     def clear(self) -> None:
         """Clear entire cache"""
-        self.cache.clear()
+        with self.lock:
+            self.cache.clear()
+            self.expiries.clear()
 
     def get(self, key: K) -> Optional[V]:
-        if key not in self.cache:
+        with self.lock:
+            expiry = self.expiries.get(key)
+            if expiry is None:
+                return None
+            if self.clock() > expiry:
+                del self.cache[key]
+                del self.expiries[key]
+                return None
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+    def put(self, key: K, value: V) -> None:
+        with self.lock:
+            if key in self.cache:
+                del self.cache[key]
+            elif len(self.cache) >= self.capacity:
+                evicted_key, _ = self.cache.popitem(last=False)
+                del self.expiries[evicted_key]
+            self.cache[key] = value
+            self.expiries[key] = self.clock() + self.ttl_in_seconds
+
+class RedisCache:
+    """
+    Redis-backed cache shared across all worker processes.
+    Values are stored JSON-encoded under a namespaced key and expire after the TTL.
+    Redis failures on reads and writes are logged and treated as cache misses.
+    Deletes and clears let RedisError propagate, so a failed invalidation is never reported as done.
+    Without a connection, one is created through the connect callable on first use.
+    """
+    def __init__(self, connection: Optional[Redis] = None, ttl_in_seconds: int = 3600, prefix: str = "cache:", connect: Optional[Callable[[], Redis]] = None):
+        self.connection = connection
+        self.connect = connect
+        self.ttl_in_seconds = ttl_in_seconds
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _redis(self) -> Redis:
+        if self.connection is None:
+            self.connection = self.connect()
+        return self.connection
+
+    def __contains__(self, key: str) -> bool:
+        """Support 'in' operator"""
+        try:
+            return bool(self._redis().exists(self._key(key)))
+        except RedisError as e:
+            logger.warning(f"Cache lookup failed for key {key}: {str(e)}")
+            return False
+
+    def __delitem__(self, key: str) -> None:
+        """Support delete operation"""
+        self._redis().delete(self._key(key))
+
+    def clear(self) -> None:
+        """Clear every key under this cache's prefix"""
+        connection = self._redis()
+        keys = list(connection.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            connection.delete(*keys)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw_value = self._redis().get(self._key(key))
+        except RedisError as e:
+            logger.warning(f"Cache read failed for key {key}: {str(e)}")
             return None
-        value, timestamp = self.cache[key]
-        if datetime.now().timestamp() - timestamp > self.ttl_in_seconds:
-            del self.cache[key]
+        if raw_value is None:
             return None
-        self.cache.move_to_end(key)
-        return value
+        return json.loads(raw_value)
 
-    def put(self, key: K, value: V) -> None:
-        if key in self.cache:
-            del self.cache[key]
-        elif len(self.cache) >= self.capacity:
-            self.cache.popitem(last=False)
-        self.cache[key] = (value, datetime.now().timestamp())
-        self.cache.move_to_end(key) 
\ No newline at end of file
+    def put(self, key: str, value: Any) -> None:
+        try:
+            self._redis().set(self._key(key), json.dumps(value), ex=self.ttl_in_seconds)
+        except RedisError as e:
+            logger.warning(f"Cache write failed for key {key}: {str(e)}")
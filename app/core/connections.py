@@ -0,0 +1,9 @@
+from functools import cache
+from redis import Redis
+
+from app.configurations import config
+
+@cache
+def get_redis_conn() -> Redis:
+    """Create the shared Redis client on first use, so importing the app does not require REDIS_URL"""
+    return Redis.from_url(config.get_redis_url())
@@ -1,16 +1,30 @@
+import functools
+import numpy as np
+import orjson
 import requests
 
-from typing import Dict, List, Tuple
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app import logger
-from app.core.cache import LRUCache
+from app.core.cache import RedisCache
+from app.core.connections import get_redis_conn
+from app.constants import MIN_SUPPORTED_YEAR, MAX_SUPPORTED_YEAR
 from app.decorators.retry_on_failure import retry_on_failure
 from app.decorators.timing import timing
 from app.exceptions.api_errors import ValidationError, APIError, ResourceNotFoundError, RateLimitError
 from app.utils.validators import validate_api_url, validate_year, validate_salary
 
 ONE_MONTH_IN_SECONDS = 2_592_000
-tax_brackets_cache = LRUCache(ttl_in_seconds=ONE_MONTH_IN_SECONDS)
+TAX_API_TIMEOUT_IN_SECONDS = (3, 10)
+CACHE_KEYS = {year: f"brackets_{year}" for year in range(MIN_SUPPORTED_YEAR, MAX_SUPPORTED_YEAR + 1)}
+bracket_min = itemgetter("min")
+tax_brackets_cache = RedisCache(connect=get_redis_conn, ttl_in_seconds=ONE_MONTH_IN_SECONDS, prefix="tax_calculator:")
+
+http_session = requests.Session()
+http_session.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+http_session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
 
 class TaxCalculator:
     @timing("TaxCalculator.fetch_tax_brackets")
@@ -28,7 +42,10 @@ class TaxCalculator:
                 logger.info(f"Cache hit for tax brackets year {year}")
                 return list(cached_data), True
 
-            response = requests.get(f"{api_url}/tax-calculator/tax-year/{year}")
+            response = http_session.get(
+                f"{api_url}/tax-calculator/tax-year/{year}",
+                timeout=TAX_API_TIMEOUT_IN_SECONDS
+            )
             
             if response.status_code == 404:
                 raise ResourceNotFoundError(f"Tax data not found for year {year}")
@@ -38,7 +55,10 @@ class TaxCalculator:
                 raise APIError("External API server error", 503)
             
             response.raise_for_status()
-            data = response.json()
+            try:
+                data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                raise APIError("Invalid response format from tax API", 502)
             
             if "tax_brackets" not in data:
                 raise APIError("Invalid response format from tax API", 502)
@@ -60,28 +80,87 @@ class TaxCalculator:
         total_tax = 0
         taxes_per_bracket = []
         
-        for _, bracket in enumerate(brackets):
+        # Brackets are walked in order of "min", so none past the first untaxed one apply
+        for bracket in sorted(brackets, key=bracket_min):
             min_amount = bracket["min"]
+            if salary <= min_amount:
+                break
+
             max_amount = bracket.get("max", float('inf'))
             rate = bracket["rate"]
 
-            if salary > min_amount:
-                taxable_in_bracket = min(salary - min_amount, max_amount - min_amount if "max" in bracket else salary - min_amount)
-                tax_in_bracket = round(taxable_in_bracket * rate, 2)
+            taxable_in_bracket = min(salary - min_amount, max_amount - min_amount if "max" in bracket else salary - min_amount)
+            tax_in_bracket = round(taxable_in_bracket * rate, 2)
+            total_tax += tax_in_bracket
+            
+            label, percentage_rate = TaxCalculator.describe_bracket(min_amount, bracket.get("max"), rate)
+            taxes_per_bracket.append({
+                "bracket": label,
+                "tax_amount": tax_in_bracket,
+                "rate": percentage_rate
+            })
+
+        total_tax = round(total_tax, 2)
+        effective_rate = round((total_tax / salary * 100), 2)
+
+        return total_tax, effective_rate, taxes_per_bracket
+
+    @timing("TaxCalculator.calculate_taxes_batch")
+    def calculate_taxes_batch(self, salaries: Sequence[float], brackets: List[Dict]) -> List[Tuple[int, float, List[Dict]]]:
+        """Calculate taxes for many validated, positive salaries against the same tax brackets"""
+        if not brackets:
+            raise ValidationError("Tax brackets cannot be empty")
+
+        brackets = sorted(brackets, key=bracket_min)
+        mins, maxs, rates = TaxCalculator._bracketize(brackets)
+        descriptions = [
+            TaxCalculator.describe_bracket(bracket["min"], bracket.get("max"), bracket["rate"])
+            for bracket in brackets
+        ]
+
+        salaries = np.asarray(salaries, dtype=np.float64)
+        taxable = np.clip(salaries[:, None] - mins, 0, maxs - mins)
+        taxes = (taxable * rates).tolist()
+        is_taxed = (salaries[:, None] > mins).tolist()
+
+        results = []
+        for salary, row_taxes, row_is_taxed in zip(salaries.tolist(), taxes, is_taxed):
+            total_tax = 0
+            taxes_per_bracket = []
+            for index, tax in enumerate(row_taxes):
+                if not row_is_taxed[index]:
+                    continue
+                tax_in_bracket = round(tax, 2)
                 total_tax += tax_in_bracket
-                
+                label, percentage_rate = descriptions[index]
                 taxes_per_bracket.append({
-                    "bracket": f"${min_amount:,.2f} to ${max_amount:,.2f}" if "max" in bracket else f"Over ${min_amount:,.2f}",
+                    "bracket": label,
                     "tax_amount": tax_in_bracket,
-                    "rate": round(rate * 100, 2)
+                    "rate": percentage_rate
                 })
 
-        total_tax = round(total_tax, 2)
-        effective_rate = round((total_tax / salary * 100), 2)
+            total_tax = round(total_tax, 2)
+            effective_rate = round((total_tax / salary * 100), 2)
+            results.append((total_tax, effective_rate, taxes_per_bracket))
 
-        return total_tax, effective_rate, taxes_per_bracket
+        return results
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def describe_bracket(min_amount: float, max_amount: Optional[float], rate: float) -> Tuple[str, float]:
+        """Get the display label and percentage rate of a bracket, formatted once per distinct bracket"""
+        label = f"${min_amount:,.2f} to ${max_amount:,.2f}" if max_amount is not None else f"Over ${min_amount:,.2f}"
+        return label, round(rate * 100, 2)
+
+    @staticmethod
+    def _bracketize(brackets: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Convert tax brackets into arrays of minimums, maximums (inf when open-ended) and rates"""
+        mins = np.array([bracket["min"] for bracket in brackets], dtype=np.float64)
+        maxs = np.array([bracket.get("max", np.inf) for bracket in brackets], dtype=np.float64)
+        rates = np.array([bracket["rate"] for bracket in brackets], dtype=np.float64)
+        return mins, maxs, rates
     
     @staticmethod
     def get_cache_key(year: int):
-        """Get cache key for tax brackets"""
-        return f"brackets_{year}"
\ No newline at end of file
+        """Get cache key for tax brackets, reusing the precomputed key for supported years"""
+        return CACHE_KEYS.get(year) or f"brackets_{year}"
\ No newline at end of file
@@ -1,5 +1,9 @@
+import orjson
 import requests
-from typing import List, Dict
+
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Tuple
 
 from app import logger
 from app.configurations import config
@@ -9,6 +13,9 @@ from app.decorators.retry_on_failure import retry_on_failure
 from app.decorators.timing import timing
 from app.utils.validators import validate_salary, validate_year
 
+MAX_FETCH_WORKERS = 16
+ZERO_SALARIES = (0, '0', '', None)
+
 tax_calculator = TaxCalculator()
 
 def get_base_response(year=DEFAULT_YEAR):
@@ -24,48 +31,66 @@ def get_base_response(year=DEFAULT_YEAR):
 @timing()
 def process_tax_calculations(calculations: List[Dict], webhook_url: str):
     """
-    Process a batch of tax calculations and send results to webhook
+    Process a batch of tax calculations and send results to webhook.
+    Calculations are grouped by year so brackets are fetched once per year,
+    concurrently across years, and taxes for each group are computed in one
+    vectorized pass.
     
     Args:
         calculations (list): List of dicts containing year and salary
         webhook_url (str): URL to send results to
     """
-    results = []
+    results: List[Dict] = [None] * len(calculations)
+    salaries_by_year: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
     
-    for calc in calculations:
-        try:
-            if not isinstance(calc, dict) or 'salary' not in calc:
-                results.append(get_base_response())
-                continue
+    for index, calc in enumerate(calculations):
+        if not isinstance(calc, dict) or 'salary' not in calc:
+            results[index] = get_base_response()
+            continue
 
+        raw_salary = calc['salary']
+        if raw_salary in ZERO_SALARIES:
+            salary = 0.0
+        else:
             try:
-                salary = validate_salary(calc['salary'])
+                salary = validate_salary(raw_salary)
             except:
-                results.append(get_base_response())
+                results[index] = get_base_response()
                 continue
 
-            try:
-                year = validate_year(calc['year'])
-            except:
-                year = DEFAULT_YEAR
+        try:
+            year = validate_year(calc['year'])
+        except:
+            year = DEFAULT_YEAR
 
-            if salary <= 0:
-                results.append(get_base_response(year))
-                continue
+        if salary <= 0:
+            results[index] = get_base_response(year)
+            continue
+
+        salaries_by_year[year].append((index, salary))
 
-            tax_brackets, _ = tax_calculator.fetch_tax_brackets(year, config.get_api_url())
-            total_tax, effective_rate, taxes_per_bracket = tax_calculator.calculate_taxes(salary, tax_brackets)
-            
-            result = {
+    brackets_by_year = fetch_tax_brackets_concurrently(list(salaries_by_year))
+
+    for year, entries in salaries_by_year.items():
+        indices = [index for index, _ in entries]
+        salaries = [salary for _, salary in entries]
+        try:
+            tax_brackets, _ = brackets_by_year[year].result()
+            calculated_taxes = tax_calculator.calculate_taxes_batch(salaries, tax_brackets)
+        except Exception as e:
+            logger.error(f"Failed to calculate taxes for year {year}: {str(e)}")
+            for index in indices:
+                results[index] = get_base_response()
+            continue
+
+        for index, salary, (total_tax, effective_rate, taxes_per_bracket) in zip(indices, salaries, calculated_taxes):
+            results[index] = {
                 "salary": round(salary, 2),
                 "year": year,
                 "total_tax": total_tax,
                 "effective_rate": effective_rate,
                 "taxes_per_bracket": taxes_per_bracket
             }
-            results.append(result)
-        except Exception as e:
-            results.append(get_base_response())
     
     try:
         send_results_to_webhook(webhook_url, results)
@@ -74,7 +99,22 @@ def process_tax_calculations(calculations: List[Dict], webhook_url: str):
 
     return results
 
+def fetch_tax_brackets_concurrently(years: List[int]) -> Dict[int, Future]:
+    """Fetch tax brackets for every year in parallel, returning a future per year"""
+    if not years:
+        return {}
+
+    def fetch(year: int):
+        return tax_calculator.fetch_tax_brackets(year, config.get_api_url())
+
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(years))) as executor:
+        return {year: executor.submit(fetch, year) for year in years}
+
 @retry_on_failure()
 def send_results_to_webhook(webhook_url: str, results: List[Dict]):
     """Send results to webhook"""
-    requests.post(webhook_url, json={"results": results})
+    requests.post(
+        webhook_url,
+        data=orjson.dumps({"results": results}),
+        headers={"Content-Type": "application/json"}
+    )
@@ -1,3 +1,5 @@
+import hmac
+
 from functools import wraps
 from flask import request
 from typing import Callable
@@ -12,7 +14,7 @@ def require_api_key(func: Callable) -> Callable:
         api_key = request.headers.get('X-API-Key')
         expected_api_key = config.get_admin_api_key()
         
-        if not api_key or api_key != expected_api_key:
+        if not api_key or not hmac.compare_digest(api_key.encode(), expected_api_key.encode()):
             raise UnauthorizedError("Unauthorized")
             
         return func(*args, **kwargs)
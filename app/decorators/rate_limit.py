@@ -1,21 +1,59 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
-from flask import request, current_app
+import hashlib
+import math
+import time
+import uuid
+
+from flask import g, request, current_app
 from functools import wraps
+from redis import RedisError
 from typing import Callable
 
+from app import logger
+from app.core.connections import get_redis_conn
 from app.exceptions.api_errors import RateLimitError
 
 DEFAULT_RATE_LIMIT_REQUESTS = 5
 DEFAULT_RATE_LIMIT_WINDOW_IN_SECONDS = 5
+RATE_LIMIT_KEY_PREFIX = "rate_limit:"
+
+def record_request(key: str, request_id: str, limit: int, window_in_seconds: float) -> int:
+    """
+    Record a request in the client's sliding window unless the window is already full
+    Returns the number of requests in the window including this one, so a result above the limit means it was rejected
+    The count is read under WATCH, so concurrent callers retry instead of recording past the limit
+    """
+    now = time.time()
 
-request_history = defaultdict(list)
+    def check_and_record(pipeline) -> int:
+        request_count = pipeline.zcount(key, now - window_in_seconds, '+inf') + 1
+        pipeline.multi()
+        pipeline.zremrangebyscore(key, '-inf', f'({now - window_in_seconds}')
+        if request_count <= limit:
+            pipeline.zadd(key, {request_id: now})
+        pipeline.expire(key, math.ceil(window_in_seconds))
+        return request_count
+
+    return get_redis_conn().transaction(check_and_record, key, value_from_callable=True)
+
+def client_key() -> str:
+    """Identify the client by IP address, API key or a stable hash of its headers, once per request"""
+    key = g.get('rate_limit_client_key')
+    if key is None:
+        key = request.remote_addr or request.headers.get('X-Forwarded-For') or request.headers.get('X-API-Key')
+        if not key:
+            digest = hashlib.blake2b(digest_size=8)
+            for name, value in sorted(request.headers.items()):
+                digest.update(f"{name}\0{value}\1".encode())
+            key = f"unknown_{digest.hexdigest()}"
+        g.rate_limit_client_key = key
+    return key
 
 def rate_limit(rate_limit_requests = DEFAULT_RATE_LIMIT_REQUESTS, 
                rate_limit_window_in_seconds = DEFAULT_RATE_LIMIT_WINDOW_IN_SECONDS) -> Callable:
     """
     Decorator to implement rate limiting using the client's IP address or fallback identifier
     Accepts optional parameters for rate limit requests and window in seconds
+    Request history is kept in a Redis sorted set per client so limits hold across all workers
     """
     if rate_limit_requests <= 0:
         raise ValueError("Rate limit requests must be greater than 0")
@@ -28,24 +66,21 @@ def rate_limit(rate_limit_requests = DEFAULT_RATE_LIMIT_REQUESTS,
             if current_app.config.get('TESTING'):
                 return func(*args, **kwargs)
 
-            unique_id = request.remote_addr or request.headers.get('X-Forwarded-For')
-            if not unique_id:
-                api_key = request.headers.get('X-API-Key')
-                unique_id = api_key if api_key else f"unknown_{hash(frozenset(request.headers.items()))}"
-            
-            now = datetime.now()
-            
-            request_history[unique_id] = [
-                timestamp for timestamp in request_history[unique_id]
-                if now - timestamp <= timedelta(seconds=rate_limit_window_in_seconds)
-            ]
-
-            if len(request_history[unique_id]) >= rate_limit_requests:
+            unique_id = client_key()
+            key = f"{RATE_LIMIT_KEY_PREFIX}{unique_id}"
+            request_id = uuid.uuid4().hex
+
+            try:
+                request_count = record_request(key, request_id, rate_limit_requests, rate_limit_window_in_seconds)
+            except RedisError as e:
+                logger.warning(f"Rate limit check failed for {unique_id}: {str(e)}")
+                request_count = 0
+
+            if request_count > rate_limit_requests:
                 raise RateLimitError(
                     f"You're being rate limited. Please try again later."
                 )
                 
-            request_history[unique_id].append(now)
             return func(*args, **kwargs)
         return wrapper
     return decorator
\ No newline at end of file
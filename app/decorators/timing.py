@@ -12,37 +12,33 @@ def timing(name: Optional[str] = None) -> Callable:
         if asyncio.iscoroutinefunction(func):
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
-                start_time = time.perf_counter()
+                start_time = time.perf_counter_ns()
                 try:
                     result = await func(*args, **kwargs)
                     return result
                 except Exception as e:
                     raise e
                 finally:
-                    end_time = time.perf_counter()
-                    execution_time = (end_time - start_time) * 1000
+                    end_time = time.perf_counter_ns()
+                    execution_time = (end_time - start_time) / 1_000_000
                     name_to_log = name or func.__name__
                     
-                    logger.info(
-                        f"Function '{name_to_log}' took {execution_time:.2f}ms to execute"
-                    )
+                    logger.info("Function '%s' took %.2fms to execute", name_to_log, execution_time)
             return async_wrapper
         else:
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
-                start_time = time.perf_counter()
+                start_time = time.perf_counter_ns()
                 try:
                     result = func(*args, **kwargs)
                     return result
                 except Exception as e:
                     raise e
                 finally:
-                    end_time = time.perf_counter()
-                    execution_time = (end_time - start_time) * 1000
+                    end_time = time.perf_counter_ns()
+                    execution_time = (end_time - start_time) / 1_000_000
                     name_to_log = name or func.__name__
                     
-                    logger.info(
-                        f"Function '{name_to_log}' took {execution_time:.2f}ms to execute"
-                    )
+                    logger.info("Function '%s' took %.2fms to execute", name_to_log, execution_time)
             return sync_wrapper
     return decorator
\ No newline at end of file
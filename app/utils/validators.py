@@ -1,10 +1,16 @@
+import functools
 import re
 
 from urllib.parse import urlparse
 from typing import Optional
 
+from app.constants import MIN_SUPPORTED_YEAR, MAX_SUPPORTED_YEAR
 from app.exceptions.api_errors import ValidationError
 
+SALARY_DELIMITERS = str.maketrans('', '', ', _\t\n\r\v\f')
+SALARY_PATTERN = re.compile(r'^-?\d*\.?\d+$')
+WHITESPACE_PATTERN = re.compile(r'\s')
+
 def validate_salary(salary: Optional[str | float]):
     """Validate salary input and remove common number delimiters"""
     if not salary:
@@ -13,35 +19,37 @@ def validate_salary(salary: Optional[str | float]):
     if isinstance(salary, (float, int)):
         return float(salary)
     
-    cleaned_salary = re.sub(r'[,\s_]', '', salary)
+    cleaned_salary = salary.translate(SALARY_DELIMITERS)
+    if not cleaned_salary.isascii():
+        # Unicode spaces such as U+00A0 and U+2009 are not in the translate table
+        cleaned_salary = WHITESPACE_PATTERN.sub('', cleaned_salary)
     
-    if not re.match(r'^-?\d*\.?\d+$', cleaned_salary):
+    if not SALARY_PATTERN.match(cleaned_salary):
         raise ValidationError("Invalid salary format")
-        
-    try:
-        return float(cleaned_salary)
-    except ValueError:
-        raise ValidationError("Invalid salary value")
+    
+    # The pattern only admits plain decimals, which float() always parses
+    return float(cleaned_salary)
     
 def validate_year(year: Optional[str | int]):
     """Validate year input and convert to integer"""
     if not year:
         raise ValidationError("Year cannot be empty")
     
+    if isinstance(year, bool) or not isinstance(year, (str, int)):
+        raise ValidationError("Invalid year format")
+    
     try:
-        if isinstance(year, int):
-            year_int = year
-        else:
-            year = year.replace(" ", "")
-            year_int = int(year)
-        if year_int < 2019 or year_int > 2023:
-            raise ValidationError("Year not supported")
-        return year_int
-    except ValueError:
+        year_int = int(year.replace(" ", "") if isinstance(year, str) else year)
+    except (TypeError, ValueError, OverflowError):
         raise ValidationError("Invalid year format")
     
+    if not MIN_SUPPORTED_YEAR <= year_int <= MAX_SUPPORTED_YEAR:
+        raise ValidationError("Year not supported")
+    return year_int
+    
+@functools.lru_cache(maxsize=32)
 def validate_api_url(api_url: str):
-    """Validate API URL"""
+    """Validate API URL, remembering URLs already accepted since the configured one repeats on every fetch"""
     if not api_url:
         raise ValidationError("API URL cannot be empty")
     
@@ -0,0 +1,29 @@
+import pytest
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class FakeClock:
+    """Virtual clock that only moves when a test sleeps or advances it."""
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def ns(self) -> int:
+        return round(self.now * 1_000_000_000)
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.advance(seconds)
+
+@pytest.fixture
+def fake_clock():
+    """Fixture providing a virtual clock starting at zero."""
+    return FakeClock()
@@ -0,0 +1,49 @@
+import fakeredis
+import orjson
+import pytest
+
+from pathlib import Path
+from rq import Queue
+from unittest.mock import patch
+
+from app import create_app
+from app.api.calculate_tax_routes import finished_jobs_cache
+from app.core.tax_calculator import tax_brackets_cache
+
+FIXTURES_DIR = Path(__file__).parent.parent / 'fixtures'
+
+@pytest.fixture(scope="session")
+def app():
+    """Build the Flask app once for the whole test session."""
+    return create_app()
+
+@pytest.fixture(scope="session")
+def expected_tax_responses():
+    """Load the expected tax responses in tests/fixtures once, keyed by file name."""
+    return {path.stem: orjson.loads(path.read_bytes()) for path in FIXTURES_DIR.glob('tax_*.json')}
+
+@pytest.fixture(autouse=True)
+def fake_redis():
+    """Point every module-level Redis user at an in-memory fake Redis."""
+    fake = fakeredis.FakeRedis()
+    with patch.object(tax_brackets_cache, 'connection', fake), \
+         patch('app.decorators.rate_limit.get_redis_conn', return_value=fake), \
+         patch('app.api.calculate_tax_routes.get_redis_conn', return_value=fake), \
+         patch('app.api.calculate_tax_routes.get_tax_queue', return_value=Queue('tax_calculations', connection=fake)):
+        yield fake
+
+@pytest.fixture(autouse=True)
+def clear_finished_jobs_cache():
+    """Keep job statuses cached in-process by one test from leaking into another."""
+    yield
+    finished_jobs_cache.clear()
+
+@pytest.fixture
+def create_test_client(app):
+    """Create a test client for the shared app, restoring its testing flag afterwards."""
+    original_testing = app.testing
+    def make_test_client(testing = True):
+        app.testing = testing
+        return app.test_client()
+    yield make_test_client
+    app.testing = original_testing
@@ -1,31 +1,32 @@
+import orjson
 import pytest
 
+from types import SimpleNamespace
 from unittest.mock import patch, Mock
 
-from app import create_app
+from app.api.calculate_tax_routes import JOB_STATUS_RATE_LIMIT_REQUESTS, MAX_CACHED_JOB_RESULTS
 from app.core.worker import process_tax_calculations
-
-@pytest.fixture
-def create_test_client():
-    """Create a test app using the factory function."""
-    def make_test_client(testing = True):
-        app = create_app()
-        app.testing = testing
-        return app.test_client()
-    return make_test_client
-
-def test_batch_calculation_success(create_test_client):
-    """Test successful submission of batch tax calculation."""
-    payload = {
-        "calculations": [
-            {"salary": 50000, "year": 2023},
-            {"salary": 100000, "year": 2022}
-        ],
-        "webhook_url": "https://example.com/webhook"
-    }
-    
-    with patch('app.api.calculate_tax_routes.tax_queue.enqueue') as mock_enqueue:
+from app.decorators.rate_limit import DEFAULT_RATE_LIMIT_REQUESTS
+
+def fake_job(status, **attrs):
+    """Build a lightweight stand-in for an RQ job that reports the given status."""
+    return SimpleNamespace(get_status=lambda refresh=True: status, **attrs)
+
+@patch('rq.Queue.enqueue')
+class TestBatchCalculation:
+    """Batch submission tests, sharing one patched queue per test."""
+
+    def test_batch_calculation_success(self, mock_enqueue, create_test_client):
+        """Test successful submission of batch tax calculation."""
+        payload = {
+            "calculations": [
+                {"salary": 50000, "year": 2023},
+                {"salary": 100000, "year": 2022}
+            ],
+            "webhook_url": "https://example.com/webhook"
+        }
         mock_enqueue.return_value.id = 'test-job-123'
+        
         response = create_test_client().post(
             '/calculate-tax',
             json=payload,
@@ -44,116 +45,149 @@ def test_batch_calculation_success(create_test_client):
             payload["webhook_url"]
         )
 
-def test_batch_calculation_missing_calculations(create_test_client):
-    """Test validation error when calculations field is missing."""
-    client = create_test_client()
-    payload = {"webhook_url": "https://example.com"}
-    
-    response = client.post(
-        '/calculate-tax',
-        json=payload,
-        headers={'Content-Type': 'application/json'}
-    )
-    assert response.status_code == 400
-    assert response.json["error"] == "calculations must be a non-empty array"
-
-def test_batch_calculation_empty_calculations(create_test_client):
-    """Test validation error when calculations array is empty."""
-    client = create_test_client()
-    payload = {"calculations": [], "webhook_url": "https://example.com"}
-    
-    response = client.post(
-        '/calculate-tax',
-        json=payload,
-        headers={'Content-Type': 'application/json'}
-    )
-    assert response.status_code == 400
-    assert response.json["error"] == "calculations must be a non-empty array"
-
-def test_batch_calculation_missing_webhook(create_test_client):
-    """Test validation error when webhook_url is missing."""
-    client = create_test_client()
-    payload = {"calculations": [{"salary": 50000}]}
-    
-    response = client.post(
-        '/calculate-tax',
-        json=payload,
-        headers={'Content-Type': 'application/json'}
-    )
-    assert response.status_code == 400
-    assert response.json["error"] == "webhook_url is required"
-
-def test_batch_calculation_invalid_json_as_string(create_test_client):
-    """Test validation error when request body is invalid JSON."""
-    client = create_test_client()
-    
-    response = client.post(
-        '/calculate-tax',
-        data="invalid json",
-        headers={'Content-Type': 'application/json'}
-    )
-    assert response.status_code == 400
-    assert response.json["error"] == "Invalid request body. Expected JSON."
-
-def test_get_job_status_queued(create_test_client):
-    """Test getting status of a queued job."""
-    with patch('app.api.calculate_tax_routes.Job') as MockJob:
-        mock_job = Mock()
-        mock_job.get_status.return_value = "queued"
-        MockJob.fetch.return_value = mock_job
+    def test_batch_calculation_missing_calculations(self, mock_enqueue, create_test_client):
+        """Test validation error when calculations field is missing."""
+        client = create_test_client()
+        payload = {"webhook_url": "https://example.com"}
         
-        response = create_test_client().get('/calculate-tax/queued-job')
-        assert response.status_code == 200
-        assert response.json == {"status": "queued"}
+        response = client.post(
+            '/calculate-tax',
+            json=payload,
+            headers={'Content-Type': 'application/json'}
+        )
+        assert response.status_code == 400
+        assert response.json["error"] == "calculations must be a non-empty array"
+        mock_enqueue.assert_not_called()
+
+    def test_batch_calculation_empty_calculations(self, mock_enqueue, create_test_client):
+        """Test validation error when calculations array is empty."""
+        client = create_test_client()
+        payload = {"calculations": [], "webhook_url": "https://example.com"}
+        
+        response = client.post(
+            '/calculate-tax',
+            json=payload,
+            headers={'Content-Type': 'application/json'}
+        )
+        assert response.status_code == 400
+        assert response.json["error"] == "calculations must be a non-empty array"
+        mock_enqueue.assert_not_called()
+
+    def test_batch_calculation_missing_webhook(self, mock_enqueue, create_test_client):
+        """Test validation error when webhook_url is missing."""
+        client = create_test_client()
+        payload = {"calculations": [{"salary": 50000}]}
+        
+        response = client.post(
+            '/calculate-tax',
+            json=payload,
+            headers={'Content-Type': 'application/json'}
+        )
+        assert response.status_code == 400
+        assert response.json["error"] == "webhook_url is required"
+        mock_enqueue.assert_not_called()
 
-def test_get_job_status_started(create_test_client):
-    """Test getting status of a started job."""
+    def test_batch_calculation_invalid_json_as_string(self, mock_enqueue, create_test_client):
+        """Test validation error when request body is invalid JSON."""
+        client = create_test_client()
+        
+        response = client.post(
+            '/calculate-tax',
+            data="invalid json",
+            headers={'Content-Type': 'application/json'}
+        )
+        assert response.status_code == 400
+        assert response.json["error"] == "Invalid request body. Expected JSON."
+        mock_enqueue.assert_not_called()
+
+    def test_batch_calculation_rate_limit(self, mock_enqueue, create_test_client):
+        """Test rate limiting for batch calculation endpoint."""
+        serialized_payload = orjson.dumps({
+            "calculations": [{"salary": 50000, "year": 2023}],
+            "webhook_url": "https://example.com/webhook"
+        })
+        mock_enqueue.return_value.id = 'test-job-123'
+        
+        with patch('app.decorators.rate_limit.record_request') as mock_record_request:
+            mock_record_request.side_effect = [DEFAULT_RATE_LIMIT_REQUESTS, DEFAULT_RATE_LIMIT_REQUESTS + 1]
+            client = create_test_client(testing=False)
+            
+            last_allowed = client.post('/calculate-tax', data=serialized_payload, content_type='application/json')
+            rate_limited = client.post('/calculate-tax', data=serialized_payload, content_type='application/json')
+        
+        assert last_allowed.status_code == 202
+        assert rate_limited.status_code == 429
+        assert "You're being rate limited. Please try again later." in rate_limited.json["error"]
+        assert mock_enqueue.call_count == 1
+
+@pytest.mark.parametrize("status,attrs,expected", [
+    ("queued", {}, {"status": "queued"}),
+    ("started", {}, {"status": "started"}),
+    (
+        "finished",
+        {"result": [{"salary": 50000, "total_tax": 7500}]},
+        {"status": "finished", "result": [{"salary": 50000, "total_tax": 7500}]}
+    ),
+    (
+        "failed",
+        {"exc_info": "Calculation failed"},
+        {"status": "failed", "error": "Calculation failed"}
+    ),
+])
+def test_get_job_status(create_test_client, status, attrs, expected):
+    """Test getting status of a job, including results or errors once it is done."""
     with patch('app.api.calculate_tax_routes.Job') as MockJob:
-        mock_job = Mock()
-        mock_job.get_status.return_value = "started"
-        MockJob.fetch.return_value = mock_job
+        MockJob.fetch.return_value = fake_job(status, **attrs)
         
-        response = create_test_client().get('/calculate-tax/started-job')
+        response = create_test_client().get(f'/calculate-tax/{status}-job')
         assert response.status_code == 200
-        assert response.json == {"status": "started"}
+        assert response.json == expected
 
-def test_get_job_status_finished(create_test_client):
-    """Test getting status of a finished job with results."""
+def test_get_job_status_finished_is_cached(create_test_client):
+    """Test that finished jobs are served from the in-process cache on later polls."""
     with patch('app.api.calculate_tax_routes.Job') as MockJob:
         mock_job = Mock()
         mock_job.get_status.return_value = "finished"
-        mock_job.result = [{"salary": 50000, "total_tax": 7500}]
+        mock_job.result = [{"salary": 75000, "total_tax": 12625}]
         MockJob.fetch.return_value = mock_job
         
-        response = create_test_client().get('/calculate-tax/finished-job')
-        assert response.status_code == 200
-        assert response.json == {
+        client = create_test_client()
+        first_response = client.get('/calculate-tax/cached-finished-job')
+        second_response = client.get('/calculate-tax/cached-finished-job')
+        
+        assert first_response.json == second_response.json == {
             "status": "finished",
-            "result": [{"salary": 50000, "total_tax": 7500}]
+            "result": [{"salary": 75000, "total_tax": 12625}]
         }
+        MockJob.fetch.assert_called_once()
+        mock_job.get_status.assert_called_once_with(refresh=False)
 
-def test_get_job_status_failed(create_test_client):
-    """Test getting status of a failed job with error message."""
+def test_get_job_status_large_result_is_not_cached(create_test_client):
+    """Test that finished jobs with large results are fetched from Redis on every poll."""
     with patch('app.api.calculate_tax_routes.Job') as MockJob:
         mock_job = Mock()
-        mock_job.get_status.return_value = "failed"
-        mock_job.exc_info = "Calculation failed"
+        mock_job.get_status.return_value = "finished"
+        mock_job.result = [{"salary": 75000, "total_tax": 12625}] * (MAX_CACHED_JOB_RESULTS + 1)
         MockJob.fetch.return_value = mock_job
         
-        response = create_test_client().get('/calculate-tax/failed-job')
-        assert response.status_code == 200
-        assert response.json == {
-            "status": "failed",
-            "error": "Calculation failed"
+        client = create_test_client()
+        first_response = client.get('/calculate-tax/large-finished-job')
+        second_response = client.get('/calculate-tax/large-finished-job')
+        
+        assert first_response.json == second_response.json == {
+            "status": "finished",
+            "result": mock_job.result
         }
+        assert MockJob.fetch.call_count == 2
 
 def test_get_job_status_not_found(create_test_client):
     """Test getting status of a non-existent job."""
     with patch('app.api.calculate_tax_routes.Job.fetch', side_effect=Exception("Job not found")):
         response = create_test_client().get('/calculate-tax/non-existent-job')
+        body = response.get_json()
         assert response.status_code == 404
-        assert "error" in response.json
-        assert "Job not found" in response.json["error"]
+        assert "error" in body
+        assert "Job not found" in body["error"]
 
 def test_get_job_status_unexpected_error(create_test_client):
     """Test handling of unexpected errors when getting job status."""
@@ -163,45 +197,22 @@ def test_get_job_status_unexpected_error(create_test_client):
         mock_fetch.return_value = mock_job
         
         response = create_test_client().get('/calculate-tax/error-job')
+        body = response.get_json()
         assert response.status_code == 500
-        assert "error" in response.json
-        assert "An unexpected error occurred" in response.json["error"]
-
-def test_batch_calculation_rate_limit(create_test_client):
-    """Test rate limiting for batch calculation endpoint."""
-    payload = {
-        "calculations": [{"salary": 50000, "year": 2023}],
-        "webhook_url": "https://example.com/webhook"
-    }
-    
-    with patch('app.api.calculate_tax_routes.tax_queue.enqueue') as mock_enqueue:
-        mock_enqueue.return_value.id = 'test-job-123'
-        client = create_test_client(testing=False)
-        
-        responses = []
-        for _ in range(10):
-            response = client.post(
-                '/calculate-tax',
-                json=payload,
-                headers={'Content-Type': 'application/json'}
-            )
-            responses.append(response)
-            
-        assert any(r.status_code == 429 for r in responses)
-        rate_limited = next(r for r in responses if r.status_code == 429)
-        assert "You're being rate limited. Please try again later." in rate_limited.json["error"]
+        assert "error" in body
+        assert "An unexpected error occurred" in body["error"]
 
 def test_get_job_status_rate_limit(create_test_client):
     """Test rate limiting for job status endpoint."""
-    with patch('app.api.calculate_tax_routes.tax_queue.enqueue') as mock_enqueue:
-        mock_enqueue.return_value.id = 'test-job-123'
+    with patch('app.api.calculate_tax_routes.Job') as MockJob, \
+         patch('app.decorators.rate_limit.record_request') as mock_record_request:
+        MockJob.fetch.return_value = fake_job("queued")
+        mock_record_request.side_effect = [JOB_STATUS_RATE_LIMIT_REQUESTS, JOB_STATUS_RATE_LIMIT_REQUESTS + 1]
         client = create_test_client(testing=False)
         
-        responses = []
-        for _ in range(10):
-            response = client.get('/calculate-tax/test-job')
-            responses.append(response)
-            
-        assert any(r.status_code == 429 for r in responses)
-        rate_limited = next(r for r in responses if r.status_code == 429)
+        last_allowed = client.get('/calculate-tax/test-job')
+        rate_limited = client.get('/calculate-tax/test-job')
+        
+        assert last_allowed.status_code == 200
+        assert rate_limited.status_code == 429
         assert "You're being rate limited. Please try again later." in rate_limited.json["error"]
@@ -1,11 +1,8 @@
 import os
 import pytest
 
-from dotenv import load_dotenv
-
-from app import create_app
-
-load_dotenv()
+from redis import RedisError
+from unittest.mock import patch
 
 @pytest.fixture
 def api_key():
@@ -20,11 +17,9 @@ def headers():
     return get_headers
 
 @pytest.fixture
-def client():
-    """Set up a test client for the app with setup and teardown logic."""
-    app = create_app()
-    app.testing = True
-    with app.test_client() as client:
+def client(create_test_client):
+    """Set up a test client for the shared app with setup and teardown logic."""
+    with create_test_client() as client:
         yield client
 
 def test_cache_api_delete(client, api_key, headers):
@@ -57,6 +52,17 @@ def test_cache_api_delete_invalid_year(client, api_key, headers):
     assert response.status_code == 404
     assert response.json == {"error": "Resource not found"}
 
+@pytest.mark.parametrize("path,failing_command", [
+    ("/cache", "scan_iter"),
+    ("/cache/tax-year/2023", "delete"),
+])
+def test_cache_api_delete_redis_unavailable(client, api_key, headers, fake_redis, path, failing_command):
+    """Test that cache deletes report a server error when Redis is unavailable."""
+    with patch.object(fake_redis, failing_command, side_effect=RedisError("down")):
+        response = client.delete(path, headers=headers(api_key))
+    assert response.status_code == 500
+    assert "error" in response.json
+
 def test_cache_hit_after_deletion(client, api_key, headers):
     """Test cache behavior after deletion."""
     response1 = client.get('/calculate-tax?salary=100000&year=2023')
@@ -1,37 +1,23 @@
 import pytest
 
-from dotenv import load_dotenv
 from unittest.mock import patch
 
-from app import create_app
-
-load_dotenv()
-
 @pytest.fixture
-def client():
-    """Set up a test client for the app with setup and teardown logic."""
-    app = create_app()
-    app.testing = True
-    with app.test_client() as client:
+def client(create_test_client):
+    """Set up a test client for the shared app with setup and teardown logic."""
+    with create_test_client() as client:
         yield client
 
-def test_404_error(client):
-    """Test the 404 error."""
-    response = client.get('/invalid-route')
-    assert response.status_code == 404
-    assert response.json == {"error": "Resource not found"}
-
-def test_405_error(client):
-    """Test the 405 error."""
-    response = client.delete('/calculate-tax')
-    assert response.status_code == 405
-    assert response.json == {"error": "Method not allowed"}
-
-def test_401_error(client):
-    """Test the 401 error."""
-    response = client.delete('/cache')
-    assert response.status_code == 401
-    assert response.json == {"error": "Unauthorized"}
+@pytest.mark.parametrize("method,path,status,body", [
+    ("get", "/invalid-route", 404, {"error": "Resource not found"}),
+    ("delete", "/calculate-tax", 405, {"error": "Method not allowed"}),
+    ("delete", "/cache", 401, {"error": "Unauthorized"}),
+])
+def test_error_responses(client, method, path, status, body):
+    """Test the 404, 405 and 401 error responses."""
+    response = getattr(client, method)(path)
+    assert response.status_code == status
+    assert response.get_json() == body
 
 def test_500_error_with_mock(client):
     """Test the 500 error using mock."""
@@ -1,94 +1,93 @@
 import pytest
-import os
 
+from dataclasses import replace
 from flask import Flask, jsonify
 from unittest.mock import patch
 
+from app.configurations import config
 from app.decorators.auth import require_api_key
-from app.exceptions.api_errors import UnauthorizedError
-from app.exceptions.config_errors import MissingEnvironmentVariable
+from app.exceptions.api_errors import APIError
+from app.exceptions.config_errors import ConfigError
 
 @pytest.fixture
-def create_test_app():
-    """Create a test Flask app with a protected route."""
-    def make_app():
-        app = Flask(__name__)
+def patch_admin_api_key():
+    """Provide a context manager that swaps the configured admin API key."""
+    def make_patch(api_key):
+        return patch('app.decorators.auth.config', replace(config, admin_api_key=api_key))
+    return make_patch
+
+def another_decorator(f):
+    def wrapper(*args, **kwargs):
+        return f(*args, **kwargs)
+    return wrapper
+
+@pytest.fixture(scope="module")
+def app():
+    """Create a test Flask app with protected routes and the app's error responses once for the module."""
+    app = Flask(__name__)
+    app.register_error_handler(APIError, lambda error: (jsonify({"error": str(error)}), error.status_code))
+    app.register_error_handler(ConfigError, lambda error: (jsonify({"error": "Server configuration error"}), error.status_code))
+    
+    @app.route('/protected')
+    @require_api_key
+    def protected_route():
+        return jsonify({"message": "success"}), 200
+    
+    @app.route('/multi-protected')
+    @require_api_key
+    @another_decorator
+    def multi_protected_route():
+        return jsonify({"message": "success"}), 200
         
-        @app.route('/protected')
-        @require_api_key
-        def protected_route():
-            return jsonify({"message": "success"}), 200
-            
-        return app
-    return make_app
+    return app
 
 @pytest.fixture
-def client(create_test_app):
+def client(app):
     """Set up a test client for the app with setup and teardown logic."""
-    app = create_test_app()
     with app.test_client() as client:
         yield client
 
 def test_missing_api_key(client):
     """Test that requests without API key are rejected."""
-    with pytest.raises(UnauthorizedError):
-        response = client.get('/protected')
-        assert response.status_code == 401
-        assert response.json == {"error": "Unauthorized"}
+    response = client.get('/protected')
+    assert response.status_code == 401
+    assert response.json == {"error": "Unauthorized"}
 
-def test_invalid_api_key(client):
+def test_invalid_api_key(client, patch_admin_api_key):
     """Test that requests with invalid API key are rejected."""
-    with pytest.raises(UnauthorizedError):
-        with patch.dict(os.environ, {'ADMIN_API_KEY': 'correct-key'}):
-            response = client.get('/protected', headers={'X-API-Key': 'wrong-key'})
-            assert response.status_code == 401
-            assert response.json == {"error": "Unauthorized"}
+    with patch_admin_api_key('correct-key'):
+        response = client.get('/protected', headers={'X-API-Key': 'wrong-key'})
+        assert response.status_code == 401
+        assert response.json == {"error": "Unauthorized"}
 
-def test_valid_api_key(client):
+def test_valid_api_key(client, patch_admin_api_key):
     """Test that requests with valid API key are allowed."""
-    with patch.dict(os.environ, {'ADMIN_API_KEY': 'test-key'}):
+    with patch_admin_api_key('test-key'):
         response = client.get('/protected', headers={'X-API-Key': 'test-key'})
         assert response.status_code == 200
         assert response.json == {"message": "success"}
 
-def test_missing_env_variable(client):
+def test_missing_env_variable(client, patch_admin_api_key):
     """Test handling of missing ADMIN_API_KEY environment variable."""
-    with patch.dict(os.environ, clear=True):
-        with pytest.raises(MissingEnvironmentVariable):
-            response = client.get('/protected', headers={'X-API-Key': 'any-key'})
-            assert response.status_code == 500
-            assert response.json == {"error": "Server configuration error"}
+    with patch_admin_api_key(None):
+        response = client.get('/protected', headers={'X-API-Key': 'any-key'})
+        assert response.status_code == 500
+        assert response.json == {"error": "Server configuration error"}
 
-def test_empty_api_key_header(client):
+def test_empty_api_key_header(client, patch_admin_api_key):
     """Test handling of empty API key in header."""
-    with pytest.raises(UnauthorizedError):
-        with patch.dict(os.environ, {'ADMIN_API_KEY': 'test-key'}):
-            response = client.get('/protected', headers={'X-API-Key': ''})
-            assert response.status_code == 401
-            assert response.json == {"error": "Missing API key"}
+    with patch_admin_api_key('test-key'):
+        response = client.get('/protected', headers={'X-API-Key': ''})
+        assert response.status_code == 401
+        assert response.json == {"error": "Unauthorized"}
 
-def test_multiple_decorators(create_test_app):
+def test_multiple_decorators(client, patch_admin_api_key):
     """Test that the auth decorator works with multiple decorators."""
-    app = create_test_app()
-    
-    def another_decorator(f):
-        def wrapper(*args, **kwargs):
-            return f(*args, **kwargs)
-        return wrapper
-    
-    @app.route('/multi-protected')
-    @require_api_key
-    @another_decorator
-    def multi_protected_route():
-        return jsonify({"message": "success"}), 200
-    
-    with app.test_client() as client:
-        with patch.dict(os.environ, {'ADMIN_API_KEY': 'test-key'}):
-            response = client.get('/multi-protected', headers={'X-API-Key': 'test-key'})
-            assert response.status_code == 200
-            assert response.json == {"message": "success"}
-            
-            with pytest.raises(UnauthorizedError):
-                response = client.get('/multi-protected', headers={'X-API-Key': 'wrong-key'})
-                assert response.status_code == 401
-                assert response.json == {"error": "Unauthorized"}
\ No newline at end of file
+    with patch_admin_api_key('test-key'):
+        response = client.get('/multi-protected', headers={'X-API-Key': 'test-key'})
+        assert response.status_code == 200
+        assert response.json == {"message": "success"}
+        
+        response = client.get('/multi-protected', headers={'X-API-Key': 'wrong-key'})
+        assert response.status_code == 401
+        assert response.json == {"error": "Unauthorized"}
\ No newline at end of file
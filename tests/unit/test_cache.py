@@ -1,27 +1,46 @@
+import fakeredis
 import pytest
+import sys
+import threading
+import time
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from redis import RedisError
+from typing import Callable
 from unittest.mock import patch
 
-from app.core.cache import LRUCache
+from app.core.cache import LRUCache, RedisCache
 
 @pytest.fixture
 def create_cache():
-    """Create a cache with configurable capacity and TTL"""
-    def make_lru_cache(capacity: int = 100, ttl_in_seconds: int = 3600):
-        return LRUCache(capacity=capacity, ttl_in_seconds=ttl_in_seconds)
+    """Create a cache with configurable capacity, TTL and clock"""
+    def make_lru_cache(capacity: int = 100, ttl_in_seconds: int = 3600, clock: Callable[[], float] = time.monotonic):
+        return LRUCache(capacity=capacity, ttl_in_seconds=ttl_in_seconds, clock=clock)
     return make_lru_cache
 
-def test_cache_set_get(create_cache):
-    """Test that the cache can set and get values"""
+@pytest.fixture
+def create_redis_cache():
+    """Create a Redis-backed cache on top of an in-memory fake Redis server"""
+    def make_redis_cache(ttl_in_seconds: int = 3600, prefix: str = "test:"):
+        return RedisCache(fakeredis.FakeRedis(), ttl_in_seconds=ttl_in_seconds, prefix=prefix)
+    return make_redis_cache
+
+@dataclass(frozen=True)
+class CustomKey:
+    id: int
+    name: str
+
+@pytest.mark.parametrize("key,value", [
+    ("2023", [{"test": "data"}]),
+    (42, "integer key"),
+    ((1, "composite"), "tuple key"),
+    (CustomKey(1, "test"), "custom key value"),
+])
+def test_cache_set_get(create_cache, key, value):
+    """Test that the cache can set and get values for any hashable key"""
     cache = create_cache()
-    cache.put("2023", [{"test": "data"}])
-    assert cache.get("2023") == [{"test": "data"}]
-    cache.put(42, "integer key")
-    assert cache.get(42) == "integer key"
-    cache.put((1, "composite"), "tuple key")
-    assert cache.get((1, "composite")) == "tuple key"
+    cache.put(key, value)
+    assert cache.get(key) == value
 
 def test_cache_clear(create_cache):
     """Test that the cache can clear"""
@@ -49,18 +68,26 @@ def test_cache_capacity_eviction(create_cache):
     assert cache.get(2) is not None
     assert cache.get(3) is not None
 
-def test_cache_ttl_expiration(create_cache):
+def test_cache_expiries_follow_entries(create_cache):
+    """Test that expiry bookkeeping is dropped together with its entry"""
+    cache = create_cache(capacity=2)
+    cache.put(1, {"first": "item"})
+    cache.put(2, {"second": "item"})
+    cache.put(3, {"third": "item"})
+    del cache[2]
+    assert set(cache.expiries) == set(cache.cache) == {3}
+    cache.clear()
+    assert cache.expiries == {}
+
+def test_cache_ttl_expiration(create_cache, fake_clock):
     """Test that the cache can evict items when the TTL expires"""
-    cache = create_cache(capacity=2, ttl_in_seconds=1)
-    start_time = datetime(2024, 1, 1, 12, 0, 0)
+    cache = create_cache(capacity=2, ttl_in_seconds=1, clock=fake_clock)
+    
+    cache.put("key", {"data": "value"})
+    assert cache.get("key") is not None
     
-    with patch('app.core.cache.datetime') as mock_datetime:
-        mock_datetime.now.return_value = start_time
-        cache.put("key", {"data": "value"})
-        assert cache.get("key") is not None
-        
-        mock_datetime.now.return_value = start_time + timedelta(seconds=1.1)
-        assert cache.get("key") is None
+    fake_clock.advance(1.1)
+    assert cache.get("key") is None
 
 def test_cache_contains_operator(create_cache):
     """Test that the cache can check if a key is in the cache"""
@@ -80,29 +107,95 @@ def test_lru_ordering(create_cache):
     assert cache.get(2) is None
     assert cache.get(3) is not None
 
-def test_custom_hashable_key(create_cache):
-    """Test that custom hashable objects work as keys"""
-    @dataclass(frozen=True)
-    class CustomKey:
-        id: int
-        name: str
+def test_custom_capacity_and_ttl(create_cache, fake_clock):
+    """Test that the cache can evict items when the capacity is reached"""
+    cache = create_cache(capacity=1, ttl_in_seconds=2, clock=fake_clock)
     
-    cache = create_cache()
-    key = CustomKey(1, "test")
-    cache.put(key, "custom key value")
-    assert cache.get(key) == "custom key value"
+    cache.put(1, {"first": "item"})
+    cache.put(2, {"second": "item"})
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    
+    fake_clock.advance(2.1)
+    assert cache.get(2) is None
 
-def test_custom_capacity_and_ttl(create_cache):
-    """Test that the cache can evict items when the capacity is reached"""
-    start_time = datetime(2024, 1, 1, 12, 0, 0)
-    cache = create_cache(capacity=1, ttl_in_seconds=2)
+def test_cache_concurrent_put_and_get(create_cache):
+    """Test that gets racing with evicting puts from other threads never raise"""
+    cache = create_cache(capacity=2)
+    errors = []
+    def hammer(offset: int):
+        try:
+            for i in range(20_000):
+                cache.put((offset + i) % 4, i)
+                cache.get((offset + i + 1) % 4)
+        except Exception as e:
+            errors.append(e)
     
-    with patch('app.core.cache.datetime') as mock_datetime:
-        mock_datetime.now.return_value = start_time
-        cache.put(1, {"first": "item"})
-        cache.put(2, {"second": "item"})
-        assert cache.get(1) is None
-        assert cache.get(2) is not None
-        
-        mock_datetime.now.return_value = start_time + timedelta(seconds=2.1)
-        assert cache.get(2) is None
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=hammer, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert errors == []
+
+def test_redis_cache_set_get(create_redis_cache):
+    """Test that the Redis cache round-trips JSON values"""
+    cache = create_redis_cache()
+    cache.put("brackets_2023", [{"min": 0, "max": 50000, "rate": 0.15}])
+    assert cache.get("brackets_2023") == [{"min": 0, "max": 50000, "rate": 0.15}]
+    assert cache.get("missing") is None
+
+def test_redis_cache_uses_prefix_and_ttl(create_redis_cache):
+    """Test that the Redis cache namespaces keys and sets an expiry"""
+    cache = create_redis_cache(ttl_in_seconds=60, prefix="brackets:")
+    cache.put("2023", {"data": "value"})
+    assert cache.connection.exists("brackets:2023")
+    assert 0 < cache.connection.ttl("brackets:2023") <= 60
+
+def test_redis_cache_contains_and_delete(create_redis_cache):
+    """Test that the Redis cache supports 'in' and 'del'"""
+    cache = create_redis_cache()
+    cache.put("2023", [{"test": "data"}])
+    cache.put("2022", [{"test": "other"}])
+    assert "2023" in cache
+    del cache["2023"]
+    assert "2023" not in cache
+    assert "2022" in cache
+
+def test_redis_cache_clear_only_own_prefix(create_redis_cache):
+    """Test that clearing the Redis cache leaves keys outside its prefix alone"""
+    cache = create_redis_cache()
+    cache.put("2023", [{"test": "data"}])
+    cache.connection.set("rq:job:123", "queued")
+    cache.clear()
+    assert cache.get("2023") is None
+    assert cache.connection.get("rq:job:123") == b"queued"
+
+def test_redis_cache_errors_are_misses(create_redis_cache):
+    """Test that Redis failures degrade to cache misses instead of raising"""
+    cache = create_redis_cache()
+    with patch.object(cache.connection, 'get', side_effect=RedisError("down")), \
+         patch.object(cache.connection, 'set', side_effect=RedisError("down")):
+        cache.put("2023", [{"test": "data"}])
+        assert cache.get("2023") is None
+
+def test_redis_cache_errors_on_contains_are_misses(create_redis_cache):
+    """Test that a failed membership check degrades to a miss"""
+    cache = create_redis_cache()
+    with patch.object(cache.connection, 'exists', side_effect=RedisError("down")):
+        assert "2023" not in cache
+
+def test_redis_cache_errors_on_delete_and_clear_raise(create_redis_cache):
+    """Test that failed invalidations raise instead of passing silently"""
+    cache = create_redis_cache()
+    with patch.object(cache.connection, 'delete', side_effect=RedisError("down")), \
+         patch.object(cache.connection, 'scan_iter', side_effect=RedisError("down")):
+        with pytest.raises(RedisError):
+            del cache["2023"]
+        with pytest.raises(RedisError):
+            cache.clear()
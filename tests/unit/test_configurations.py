@@ -0,0 +1,52 @@
+import pytest
+import os
+
+from unittest.mock import patch
+
+from app.configurations import Config
+from app.exceptions.config_errors import MissingEnvironmentVariable
+
+@pytest.fixture
+def no_admin_key(monkeypatch):
+    """Unset only ADMIN_API_KEY for the duration of a test."""
+    monkeypatch.delenv('ADMIN_API_KEY', raising=False)
+
+def test_config_from_env():
+    """Test that the configuration is read from the environment."""
+    environment = {
+        'ADMIN_API_KEY': 'test-key',
+        'REDIS_URL': 'redis://localhost:6379',
+        'API_URL': 'http://localhost:5001'
+    }
+    with patch.dict(os.environ, environment):
+        config = Config.from_env()
+    
+    assert config.get_admin_api_key() == 'test-key'
+    assert config.get_redis_url() == 'redis://localhost:6379'
+    assert config.get_api_url() == 'http://localhost:5001'
+
+def test_config_is_a_snapshot():
+    """Test that later environment changes don't leak into an existing configuration."""
+    with patch.dict(os.environ, {'API_URL': 'http://localhost:5001'}):
+        config = Config.from_env()
+    
+    with patch.dict(os.environ, {'API_URL': 'http://changed:5001'}):
+        assert config.get_api_url() == 'http://localhost:5001'
+
+def test_config_missing_variable():
+    """Test that missing variables raise when they are requested."""
+    config = Config(admin_api_key=None, redis_url='', api_url=None)
+    
+    with pytest.raises(MissingEnvironmentVariable):
+        config.get_admin_api_key()
+    with pytest.raises(MissingEnvironmentVariable):
+        config.get_redis_url()
+    with pytest.raises(MissingEnvironmentVariable):
+        config.get_api_url()
+
+def test_config_from_env_missing_admin_key(no_admin_key):
+    """Test that an unset ADMIN_API_KEY only raises once it is requested."""
+    config = Config.from_env()
+    
+    with pytest.raises(MissingEnvironmentVariable):
+        config.get_admin_api_key()
\ No newline at end of file
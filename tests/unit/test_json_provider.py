@@ -0,0 +1,39 @@
+import pytest
+
+from decimal import Decimal
+from flask import Flask
+
+from app.utils.json_provider import ORJSONProvider
+
+@pytest.fixture
+def json_provider():
+    """Fixture providing an orjson provider bound to a bare Flask app."""
+    return ORJSONProvider(Flask(__name__))
+
+def test_json_provider_round_trip(json_provider):
+    """Test that values survive a dumps/loads round trip."""
+    payload = {"salary": 50000.5, "taxes_per_bracket": [{"rate": 15.0}], "year": 2023}
+    assert json_provider.loads(json_provider.dumps(payload)) == payload
+    assert json_provider.loads(b'{"salary": 1}') == {"salary": 1}
+
+def test_json_provider_default_fallback(json_provider):
+    """Test that types orjson doesn't support fall back to Flask's defaults."""
+    assert json_provider.loads(json_provider.dumps({"amount": Decimal("1.50")})) == {"amount": "1.50"}
+
+def test_json_provider_invalid_json(json_provider):
+    """Test that invalid JSON raises a ValueError like the standard library."""
+    with pytest.raises(ValueError):
+        json_provider.loads("invalid json")
+
+def test_json_provider_non_str_keys(json_provider):
+    """Test that int-keyed dicts serialize with string keys like the standard library."""
+    assert json_provider.loads(json_provider.dumps({2023: 1, 2022: 2})) == {"2022": 2, "2023": 1}
+
+def test_json_provider_sort_keys(json_provider):
+    """Test that keys are sorted by default and left in order when sort_keys is off."""
+    assert json_provider.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+    assert json_provider.dumps({"b": 1, "a": 2}, sort_keys=False) == '{"b":1,"a":2}'
+
+def test_json_provider_big_int(json_provider):
+    """Test that integers wider than 64 bits fall back to the standard library."""
+    assert json_provider.loads(json_provider.dumps({"salary": 2 ** 70})) == {"salary": 2 ** 70}
@@ -1,28 +1,45 @@
+import fakeredis
 import pytest
 
-from datetime import datetime, timedelta
-from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from flask import g
+from redis import RedisError
+from unittest.mock import patch, Mock
 
 from app import create_app
-from app.decorators.rate_limit import rate_limit, request_history
+from app.decorators.rate_limit import client_key, rate_limit, record_request, RATE_LIMIT_KEY_PREFIX
 from app.exceptions.api_errors import RateLimitError
 
+RATE_LIMIT_BUDGET_IN_SECONDS = 0.005
+
 @pytest.fixture(autouse=True)
-def clear_request_history():
-    """Clear request history before and after each test."""
-    request_history.clear()
-    yield
-    request_history.clear()
+def fake_redis():
+    """Back the rate limiter with a fresh in-memory Redis for each test."""
+    fake = fakeredis.FakeRedis()
+    with patch('app.decorators.rate_limit.get_redis_conn', return_value=fake):
+        yield fake
+
+@pytest.fixture(scope="session")
+def test_apps():
+    """Build one normal and one testing app for the whole session."""
+    apps = {False: create_app(), True: create_app()}
+    apps[True].testing = True
+    return apps
 
 @pytest.fixture
-def create_test_client():
-    """Create a test app using the factory function."""
+def create_test_client(test_apps):
+    """Look up the shared test app for the requested testing mode."""
     def make_test_client(testing = False):
-        app = create_app()
-        app.testing = testing
-        return app
+        return test_apps[testing]
     return make_test_client
 
+@pytest.fixture
+def frozen_clock(monkeypatch, fake_clock):
+    """Drive the rate limiter from a virtual clock, patched once per test."""
+    fake_clock.now = 1000.0
+    monkeypatch.setattr('app.decorators.rate_limit.time', Mock(time=fake_clock))
+    return fake_clock
+
 @pytest.fixture
 def create_rate_limited_function():
     """
@@ -63,21 +80,18 @@ def test_rate_limit_exceeded(create_test_client, create_test_env, create_rate_li
         
         assert "You're being rate limited. Please try again later." in str(exc_info.value)
 
-def test_rate_limit_window_expiry(create_test_client, create_test_env, create_rate_limited_function):
+def test_rate_limit_window_expiry(create_test_client, create_test_env, create_rate_limited_function, frozen_clock):
     """Test that rate limit resets after window expiry."""
     test_function = create_rate_limited_function(requests=1, window=2)
-    start_time = datetime.now()
     with create_test_client().test_request_context(environ_base=create_test_env()):
-        with patch('app.decorators.rate_limit.datetime') as mock_datetime:
-            mock_datetime.now.return_value = start_time
-            assert test_function() == "success"
-            
-            mock_datetime.now.return_value = start_time + timedelta(seconds=1)
-            with pytest.raises(RateLimitError):
-                test_function()
-            
-            mock_datetime.now.return_value = start_time + timedelta(seconds=2, milliseconds=1)
-            assert test_function() == "success"
+        assert test_function() == "success"
+        
+        frozen_clock.advance(1)
+        with pytest.raises(RateLimitError):
+            test_function()
+        
+        frozen_clock.advance(1.001)
+        assert test_function() == "success"
 
 def test_rate_limit_different_ips(create_test_client, create_test_env, create_rate_limited_function):
     """Test that rate limits are tracked separately for different IPs."""
@@ -96,37 +110,38 @@ def test_rate_limit_testing_mode(create_test_client, create_test_env, create_rat
         for _ in range(10):
             assert test_function() == "success"
 
-def test_rate_limit_cleanup(create_test_client, create_test_env, create_rate_limited_function):
+def test_rate_limit_cleanup(create_test_client, create_test_env, create_rate_limited_function, fake_redis, frozen_clock):
     """Test that old requests are cleaned up from history."""
     test_function = create_rate_limited_function(requests=1, window=2)
     test_env = create_test_env()
+    key = f"{RATE_LIMIT_KEY_PREFIX}{test_env['REMOTE_ADDR']}"
     with create_test_client().test_request_context(environ_base=test_env):
-        with patch('app.decorators.rate_limit.datetime') as mock_datetime:
-            old_time = datetime(2024, 1, 1, 12, 0, 0)
-            current_time = datetime(2024, 1, 1, 12, 0, 3)
-            
-            request_history[test_env['REMOTE_ADDR']] = [old_time]
-            
-            mock_datetime.now.return_value = current_time
-            
-            assert test_function() == "success"
-            
-            assert len(request_history[test_env['REMOTE_ADDR']]) == 1
-            stored_time = request_history[test_env['REMOTE_ADDR']][0]
-            assert stored_time == current_time
-            assert old_time not in request_history[test_env['REMOTE_ADDR']]
+        fake_redis.zadd(key, {"old-request": frozen_clock()})
+        
+        frozen_clock.advance(3)
+        
+        assert test_function() == "success"
+        
+        history = fake_redis.zrange(key, 0, -1, withscores=True)
+        assert len(history) == 1
+        assert history[0][1] == frozen_clock()
+        assert fake_redis.zscore(key, "old-request") is None
 
-def test_rate_limit_invalid_parameters():
-    """Test that rate limit decorator validates its parameters."""
-    with pytest.raises(ValueError):
-        @rate_limit(rate_limit_requests=0)
-        def func():
-            return "success"
+def test_rate_limit_idle_keys_expire(create_test_client, create_test_env, create_rate_limited_function, fake_redis):
+    """Test that a client's history key expires once its window has passed."""
+    test_function = create_rate_limited_function(requests=2, window=5)
+    test_env = create_test_env("3.3.3.3")
+    key = f"{RATE_LIMIT_KEY_PREFIX}{test_env['REMOTE_ADDR']}"
+    with create_test_client().test_request_context(environ_base=test_env):
+        test_function()
     
+    assert 0 < fake_redis.ttl(key) <= 5
+
+@pytest.mark.parametrize("requests,window", [(0, 5), (5, 0), (-1, 5), (5, -1)])
+def test_rate_limit_invalid_parameters(requests, window):
+    """Test that rate limit decorator validates its parameters."""
     with pytest.raises(ValueError):
-        @rate_limit(rate_limit_window_in_seconds=0)
-        def func():
-            return "success"
+        rate_limit(rate_limit_requests=requests, rate_limit_window_in_seconds=window)
 
 def test_rate_limit_api_key(create_test_client, create_rate_limited_function):
     """Test that requests without IP address are still rate limited using api key."""
@@ -165,6 +180,20 @@ def test_rate_limit_headers(create_test_client, create_rate_limited_function):
         with pytest.raises(RateLimitError):
             test_function()
 
+def test_rate_limit_header_key_is_stable(create_test_client):
+    """Test that the header-derived client key is a fixed-size digest that repeats for the same headers."""
+    client = create_test_client()
+    headers = {'User-Agent': 'test-browser', 'Accept': 'application/json'}
+    with client.test_request_context(environ_base={}, headers=headers):
+        key = client_key()
+        assert g.rate_limit_client_key == key
+    
+    with client.test_request_context(environ_base={}, headers=dict(reversed(headers.items()))):
+        assert client_key() == key
+    
+    assert key.startswith("unknown_")
+    assert len(key) == len("unknown_") + 16
+
 def test_rate_limit_different_headers(create_test_client, create_rate_limited_function):
     """Test that requests with different headers get different rate limits when IP and api key are missing."""
     client = create_test_client()
@@ -178,47 +207,77 @@ def test_rate_limit_different_headers(create_test_client, create_rate_limited_fu
     with client.test_request_context(environ_base={}, headers=headers2):
         assert test_function() == "success"
 
-def test_rate_limit_concurrent_requests(create_test_client, create_test_env, create_rate_limited_function):
+def test_rate_limit_concurrent_requests(create_test_client, create_test_env, create_rate_limited_function, frozen_clock):
     """Test that concurrent requests (same timestamp) are properly rate limited."""
     test_function = create_rate_limited_function(requests=2, window=5)
-    fixed_time = datetime.now()
     
     with create_test_client().test_request_context(environ_base=create_test_env()):
-        with patch('app.decorators.rate_limit.datetime') as mock_datetime:
-            mock_datetime.now.return_value = fixed_time
-            
-            assert test_function() == "success"
-            assert test_function() == "success"
-            
-            with pytest.raises(RateLimitError):
-                test_function()
+        assert test_function() == "success"
+        assert test_function() == "success"
+        
+        with pytest.raises(RateLimitError):
+            test_function()
 
-def test_rate_limit_window_boundary(create_test_client, create_test_env, create_rate_limited_function):
+def test_rate_limit_window_boundary(create_test_client, create_test_env, create_rate_limited_function, frozen_clock):
     """Test rate limiting behavior exactly at window boundaries."""
     test_function = create_rate_limited_function(requests=1, window=5)
-    start_time = datetime.now()
     
     with create_test_client().test_request_context(environ_base=create_test_env()):
-        with patch('app.decorators.rate_limit.datetime') as mock_datetime:
-            mock_datetime.now.return_value = start_time
-            assert test_function() == "success"
-            
-            mock_datetime.now.return_value = start_time + timedelta(seconds=5)
-            with pytest.raises(RateLimitError):
-                test_function()
-            
-            mock_datetime.now.return_value = start_time + timedelta(seconds=5, microseconds=1)
-            assert test_function() == "success"
+        assert test_function() == "success"
+        
+        frozen_clock.advance(5)
+        with pytest.raises(RateLimitError):
+            test_function()
+        
+        frozen_clock.advance(0.000001)
+        assert test_function() == "success"
 
-def test_rate_limit_history_size(create_test_client, create_test_env, create_rate_limited_function):
+def test_rate_limit_history_size(create_test_client, create_test_env, create_rate_limited_function, fake_redis, frozen_clock):
     """Test that request history doesn't grow indefinitely for an IP."""
     test_env = create_test_env()
     test_function = create_rate_limited_function(requests=5, window=2)
-    start_time = datetime.now()
     
     with create_test_client().test_request_context(environ_base=test_env):
-        with patch('app.decorators.rate_limit.datetime') as mock_datetime:
-            for i in range(10):
-                mock_datetime.now.return_value = start_time + timedelta(seconds=i)
+        for _ in range(10):
+            test_function()
+            assert fake_redis.zcard(f"{RATE_LIMIT_KEY_PREFIX}{test_env['REMOTE_ADDR']}") <= 5
+            frozen_clock.advance(1)
+
+def test_rate_limit_rejected_requests_not_recorded(create_test_client, create_test_env, create_rate_limited_function, fake_redis):
+    """Test that requests rejected by the limiter don't extend the client's window."""
+    test_env = create_test_env()
+    test_function = create_rate_limited_function(requests=1, window=5)
+    
+    with create_test_client().test_request_context(environ_base=test_env):
+        test_function()
+        for _ in range(3):
+            with pytest.raises(RateLimitError):
                 test_function()
-                assert len(request_history[test_env['REMOTE_ADDR']]) <= 5
+        assert fake_redis.zcard(f"{RATE_LIMIT_KEY_PREFIX}{test_env['REMOTE_ADDR']}") == 1
+
+def test_record_request_concurrent_callers_stay_within_limit(fake_redis):
+    """Test that callers racing on one window never record more requests than the limit."""
+    key = f"{RATE_LIMIT_KEY_PREFIX}racing-client"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        counts = list(executor.map(lambda i: record_request(key, f"request-{i}", 5, 5), range(40)))
+    
+    assert sum(count <= 5 for count in counts) == 5
+    assert fake_redis.zcard(key) == 5
+
+def test_rate_limit_redis_unavailable(create_test_client, create_test_env, create_rate_limited_function, fake_redis):
+    """Test that requests are allowed through when Redis is unavailable."""
+    test_function = create_rate_limited_function(requests=1, window=5)
+    
+    with create_test_client().test_request_context(environ_base=create_test_env()):
+        with patch.object(fake_redis, 'pipeline', side_effect=RedisError("down")):
+            assert test_function() == "success"
+            assert test_function() == "success"
+
+@pytest.mark.benchmark
+def test_rate_limit_benchmark(benchmark, create_test_client, create_test_env, create_rate_limited_function):
+    """Test that a rate limit check stays within its time budget."""
+    test_function = create_rate_limited_function(requests=1_000, window=60)
+    with create_test_client().test_request_context(environ_base=create_test_env()):
+        assert benchmark.pedantic(test_function, rounds=100) == "success"
+    if benchmark.enabled:
+        assert benchmark.stats.stats.mean < RATE_LIMIT_BUDGET_IN_SECONDS
@@ -1,6 +1,5 @@
 import pytest
 import requests
-import time
 
 from unittest.mock import patch, Mock
 
@@ -82,7 +81,7 @@ def test_retry_with_other_exception(mock_logger):
     mock_logger.warning.assert_not_called()
     mock_logger.error.assert_not_called()
 
-def test_retry_delay_timing():
+def test_retry_delay_timing(fake_clock):
     """Test that retry delays increase with each attempt."""
     mock_func = Mock(side_effect=[
         requests.RequestException("Error 1"),
@@ -94,13 +93,13 @@ def test_retry_delay_timing():
     def test_function():
         return mock_func()
     
-    start_time = time.time()
-    result = test_function()
-    end_time = time.time()
+    with patch('app.decorators.retry_on_failure.time', Mock(sleep=fake_clock.sleep)):
+        result = test_function()
     
     assert result == "success"
     assert mock_func.call_count == 3
-    assert end_time - start_time >= 0.3
+    assert fake_clock.sleeps == pytest.approx([0.1, 0.2])
+    assert fake_clock() >= 0.3
 
 def test_retry_with_args_kwargs(mock_logger):
     """Test that function retries work with arguments."""
@@ -118,19 +117,11 @@ def test_retry_with_args_kwargs(mock_logger):
     assert mock_func.call_count == 2
     mock_logger.warning.assert_called_once()
 
-def test_retry_zero_retries():
-    """Test that function raises ValidationError with zero retries."""
-    with pytest.raises(ValidationError):
-        @retry_on_failure(max_retries=0, delay_in_seconds=0)
-        def test_function():
-            raise requests.RequestException("Connection error")
-    
-def test_retry_negative_retries():
-    """Test that function raises ValidationError with negative retries."""
+@pytest.mark.parametrize("max_retries", [0, -1])
+def test_retry_invalid_retries(max_retries):
+    """Test that function raises ValidationError with zero or negative retries."""
     with pytest.raises(ValidationError):
-        @retry_on_failure(max_retries=-1, delay_in_seconds=0)
-        def test_function():
-            raise requests.RequestException("Connection error")
+        retry_on_failure(max_retries=max_retries, delay_in_seconds=0)
 
 def test_retry_with_multiple_decorators(mock_logger):
     """Test that retry decorator works with other decorators."""
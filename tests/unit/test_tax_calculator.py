@@ -1,23 +1,27 @@
 import pytest
-import os
 
-from app.core.tax_calculator import TaxCalculator
-from app.exceptions.api_errors import ValidationError
+from unittest.mock import patch, Mock
 
-@pytest.fixture
+from app.configurations import config
+from app.core.tax_calculator import TaxCalculator, TAX_API_TIMEOUT_IN_SECONDS
+from app.exceptions.api_errors import APIError, ValidationError, RateLimitError
+
+CALCULATE_TAXES_BUDGET_IN_SECONDS = 0.001
+
+@pytest.fixture(scope="module")
 def expected_response_of_tax_brackets_for_year_2023():
     """Fixture providing expected response of tax brackets for year 2023."""
     return [{'max': 53359, 'min': 0, 'rate': 0.15}, {'max': 106717, 'min': 53359, 'rate': 0.205}, {'max': 165430, 'min': 106717, 'rate': 0.26}, {'max': 235675, 'min': 165430, 'rate': 0.29}, {'min': 235675, 'rate': 0.33}]
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def tax_calculator():
     """Fixture providing a TaxCalculator instance."""
     return TaxCalculator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_url():
-    """Fixture providing the API URL."""
-    return os.getenv('API_URL') or 'http://127.0.0.1:5001'
+    """Fixture providing the API URL from the configuration snapshot."""
+    return config.api_url or 'http://127.0.0.1:5001'
 
 def test_fetch_tax_brackets(tax_calculator, api_url, expected_response_of_tax_brackets_for_year_2023):
     """Test that the tax brackets are fetched correctly."""
@@ -29,6 +33,27 @@ def test_fetch_tax_brackets_invalid_year(tax_calculator, api_url):
     with pytest.raises(ValidationError):
         tax_calculator.fetch_tax_brackets(2018, api_url)
 
+def test_fetch_tax_brackets_uses_pooled_session(tax_calculator, api_url):
+    """Test that tax brackets are fetched through the shared session with a timeout."""
+    with patch('app.core.tax_calculator.tax_brackets_cache.get', return_value=None), \
+         patch('app.core.tax_calculator.http_session.get', return_value=Mock(status_code=429)) as mock_get:
+        with pytest.raises(RateLimitError):
+            tax_calculator.fetch_tax_brackets(2023, api_url)
+        
+        mock_get.assert_called_once_with(
+            f"{api_url}/tax-calculator/tax-year/2023",
+            timeout=TAX_API_TIMEOUT_IN_SECONDS
+        )
+
+def test_fetch_tax_brackets_invalid_json(tax_calculator, api_url, fake_clock):
+    """Test that a malformed API response is reported as a bad gateway."""
+    with patch('app.core.tax_calculator.tax_brackets_cache.get', return_value=None), \
+         patch('app.core.tax_calculator.http_session.get', return_value=Mock(status_code=200, content=b"<html>")), \
+         patch('app.decorators.retry_on_failure.time', Mock(sleep=fake_clock.sleep)):
+        with pytest.raises(APIError) as exc_info:
+            tax_calculator.fetch_tax_brackets(2023, api_url)
+    assert exc_info.value.status_code == 502
+
 def test_calculate_taxes(tax_calculator):
     """Test that the taxes are calculated correctly."""
     tax_brackets = [
@@ -48,6 +73,30 @@ def test_calculate_taxes(tax_calculator):
     assert total_tax == 12625.00
     assert effective_rate == pytest.approx(16.83, 0.01)
 
+def test_calculate_taxes_batch(tax_calculator, expected_response_of_tax_brackets_for_year_2023):
+    """Test that batch calculation matches calculating each salary on its own."""
+    salaries = [1000, 53359, 75000.55, 500000]
+    
+    results = tax_calculator.calculate_taxes_batch(salaries, expected_response_of_tax_brackets_for_year_2023)
+    
+    assert results == [
+        tax_calculator.calculate_taxes(salary, expected_response_of_tax_brackets_for_year_2023)
+        for salary in salaries
+    ]
+
+def test_calculate_taxes_unsorted_brackets(tax_calculator, expected_response_of_tax_brackets_for_year_2023):
+    """Test that bracket order does not change the result, and single and batch calculation agree."""
+    unsorted_brackets = list(reversed(expected_response_of_tax_brackets_for_year_2023))
+    expected = tax_calculator.calculate_taxes(75000, expected_response_of_tax_brackets_for_year_2023)
+    
+    assert tax_calculator.calculate_taxes(75000, unsorted_brackets) == expected
+    assert tax_calculator.calculate_taxes_batch([75000], unsorted_brackets) == [expected]
+
+def test_calculate_taxes_batch_invalid_tax_brackets(tax_calculator):
+    """Test that batch calculation rejects empty tax brackets."""
+    with pytest.raises(ValidationError):
+        tax_calculator.calculate_taxes_batch([75000], [])
+
 def test_calculate_taxes_invalid_salary(tax_calculator, expected_response_of_tax_brackets_for_year_2023):
     """Test that the taxes are not calculated for an invalid salary."""
     with pytest.raises(ValidationError):
@@ -58,6 +107,25 @@ def test_calculate_taxes_invalid_tax_brackets(tax_calculator):
     with pytest.raises(ValidationError):
         tax_calculator.calculate_taxes(75000, None)
 
+def test_describe_bracket():
+    """Test that bracket labels and percentage rates are formatted correctly."""
+    assert TaxCalculator.describe_bracket(0, 50000, 0.15) == ("$0.00 to $50,000.00", 15.0)
+    assert TaxCalculator.describe_bracket(50000, None, 0.205) == ("Over $50,000.00", 20.5)
+
 def test_get_cache_key():
     """Test that the cache key is generated correctly."""
     assert TaxCalculator.get_cache_key(2023) == "brackets_2023"
+    assert TaxCalculator.get_cache_key(2023) is TaxCalculator.get_cache_key(2023)
+    assert TaxCalculator.get_cache_key(2030) == "brackets_2030"
+
+@pytest.mark.benchmark
+def test_calculate_taxes_benchmark(benchmark, tax_calculator, expected_response_of_tax_brackets_for_year_2023):
+    """Test that a single tax calculation stays within its time budget."""
+    result = benchmark.pedantic(
+        tax_calculator.calculate_taxes,
+        args=(500000, expected_response_of_tax_brackets_for_year_2023),
+        rounds=100
+    )
+    assert result[0] == 141805.92
+    if benchmark.enabled:
+        assert benchmark.stats.stats.mean < CALCULATE_TAXES_BUDGET_IN_SECONDS
@@ -1,7 +1,6 @@
 import pytest
-import time
 
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 
 from app.decorators.timing import timing
 
@@ -20,9 +19,9 @@ def test_timing_basic_function(mock_logger):
     result = test_function()
     assert result == "success"
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'test_function' took" in log_message
-    assert "ms to execute" in log_message
+    message_format, logged_name, execution_time = mock_logger.info.call_args[0]
+    assert logged_name == "test_function"
+    assert message_format % (logged_name, execution_time) == f"Function 'test_function' took {execution_time:.2f}ms to execute"
 
 def test_timing_with_custom_name(mock_logger):
     """Test that the timing decorator uses custom name when provided."""
@@ -33,21 +32,21 @@ def test_timing_with_custom_name(mock_logger):
     result = test_function()
     assert result == "success"
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'custom_operation' took" in log_message
+    _, logged_name, _ = mock_logger.info.call_args[0]
+    assert logged_name == "custom_operation"
 
-def test_timing_with_sleep(mock_logger):
+def test_timing_with_sleep(mock_logger, fake_clock):
     """Test that the timing decorator accurately measures longer operations."""
     @timing()
     def slow_function():
-        time.sleep(0.1)
+        fake_clock.sleep(0.1)
         return "done"
     
-    result = slow_function()
+    with patch('app.decorators.timing.time', Mock(perf_counter_ns=fake_clock.ns)):
+        result = slow_function()
     assert result == "done"
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    execution_time = float(log_message.split("took ")[1].split("ms")[0])
+    _, _, execution_time = mock_logger.info.call_args[0]
     assert execution_time >= 100
 
 def test_timing_with_args_kwargs(mock_logger):
@@ -59,8 +58,8 @@ def test_timing_with_args_kwargs(mock_logger):
     result = add_numbers(2, 3)
     assert result == 5
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'calculator' took" in log_message
+    _, logged_name, _ = mock_logger.info.call_args[0]
+    assert logged_name == "calculator"
 
 def test_timing_with_value_error(mock_logger):
     """Test that the timing decorator logs time even when function raises exception."""
@@ -73,8 +72,8 @@ def test_timing_with_value_error(mock_logger):
     
     assert str(exc_info.value) == "Test error"
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'failing_function' took" in log_message
+    _, logged_name, _ = mock_logger.info.call_args[0]
+    assert logged_name == "failing_function"
 
 def test_timing_with_type_error(mock_logger):
     """Test that the timing decorator handles different types of exceptions."""
@@ -86,8 +85,8 @@ def test_timing_with_type_error(mock_logger):
         type_error_function()
     
     assert mock_logger.info.call_count == 1
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'type_error_func' took" in log_message
+    _, logged_name, _ = mock_logger.info.call_args[0]
+    assert logged_name == "type_error_func"
 
 def test_timing_nested_decorators(mock_logger):
     """Test that the timing decorator works with other decorators."""
@@ -104,8 +103,8 @@ def test_timing_nested_decorators(mock_logger):
     result = test_function()
     assert result == "success"
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'test_function' took" in log_message
+    _, logged_name, _ = mock_logger.info.call_args[0]
+    assert logged_name == "test_function"
 
 def test_timing_class_method(mock_logger):
     """Test that the timing decorator works with class methods."""
@@ -118,24 +117,25 @@ def test_timing_class_method(mock_logger):
     result = instance.test_method()
     assert result == "success"
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'class_operation' took" in log_message
+    _, logged_name, _ = mock_logger.info.call_args[0]
+    assert logged_name == "class_operation"
 
-def test_timing_async_function(mock_logger):
+def test_timing_async_function(mock_logger, fake_clock):
     """Test that the timing decorator works with async functions."""
     import asyncio
     
     @timing()
     async def async_function():
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
+        fake_clock.advance(0.1)
         return "success"
     
-    result = asyncio.run(async_function())
+    with patch('app.decorators.timing.time', Mock(perf_counter_ns=fake_clock.ns)):
+        result = asyncio.run(async_function())
     assert result == "success"
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'async_function' took" in log_message
-    execution_time = float(log_message.split("took ")[1].split("ms")[0])
+    _, logged_name, execution_time = mock_logger.info.call_args[0]
+    assert logged_name == "async_function"
     assert execution_time >= 100
 
 def test_timing_generator_function(mock_logger):
@@ -148,5 +148,5 @@ def test_timing_generator_function(mock_logger):
     result = list(generate_numbers())
     assert result == [0, 1, 2]
     mock_logger.info.assert_called_once()
-    log_message = mock_logger.info.call_args[0][0]
-    assert "Function 'generate_numbers' took" in log_message 
\ No newline at end of file
+    _, logged_name, _ = mock_logger.info.call_args[0]
+    assert logged_name == "generate_numbers" 
\ No newline at end of file
@@ -8,6 +8,9 @@ def test_validate_salary_valid():
     assert validate_salary("1000.50") == 1000.50
     assert validate_salary("1,000.50") == 1000.50
     assert validate_salary("1_000.50") == 1000.50
+    assert validate_salary(" 1 000\t000 ") == 1000000.0
+    assert validate_salary("50\xa0000") == 50000.0
+    assert validate_salary("50\u2009000") == 50000.0
     assert validate_salary("1000") == 1000.0
     assert validate_salary(1000) == 1000.0
     assert validate_salary(1000.50) == 1000.50
@@ -19,6 +22,10 @@ def test_validate_salary_invalid():
         validate_salary("invalid")
     with pytest.raises(ValidationError):
         validate_salary("10.5.5")
+    with pytest.raises(ValidationError):
+        validate_salary("inf")
+    with pytest.raises(ValidationError):
+        validate_salary("1e5")
 
 def test_validate_year_valid():
     """Test that the year is validated correctly."""
@@ -31,11 +38,25 @@ def test_validate_year_invalid():
         validate_year("202x")
     with pytest.raises(ValidationError):
         validate_year("2025")
+    with pytest.raises(ValidationError):
+        validate_year(2018)
+    with pytest.raises(ValidationError):
+        validate_year([2023])
+    with pytest.raises(ValidationError, match="Invalid year format"):
+        validate_year(2022.9)
+    with pytest.raises(ValidationError, match="Invalid year format"):
+        validate_year(True)
+    with pytest.raises(ValidationError, match="Invalid year format"):
+        validate_year(float("inf"))
 
 def test_validate_api_url_valid():
     """Test that the API URL is validated correctly."""
     assert validate_api_url("http://0.0.0.0:5001") == "http://0.0.0.0:5001"
     assert validate_api_url("https://google.com") == "https://google.com"
+    
+    hits = validate_api_url.cache_info().hits
+    assert validate_api_url("https://google.com") == "https://google.com"
+    assert validate_api_url.cache_info().hits == hits + 1
 
 def test_validate_api_url_invalid():
     """Test that the API URL is not validated for an invalid API URL."""
@@ -1,195 +1,172 @@
+import orjson
 import pytest
 import requests
 
-from unittest.mock import patch, Mock
+from types import SimpleNamespace
+from unittest.mock import Mock, call
 
-from app.core.worker import process_tax_calculations, get_base_response
+from app.core.worker import process_tax_calculations, get_base_response, fetch_tax_brackets_concurrently, send_results_to_webhook
 from app.constants import DEFAULT_YEAR
 
+pytestmark = pytest.mark.worker_unit
+
+@pytest.fixture(scope="session")
+def webhook_url():
+    """Fixture providing the webhook URL results are sent to."""
+    return "https://example.com/webhook"
+
+@pytest.fixture(autouse=True)
+def mock_send(monkeypatch):
+    """Keep every test from posting to a real webhook."""
+    mock = Mock()
+    monkeypatch.setattr('app.core.worker.send_results_to_webhook', mock)
+    return mock
+
 @pytest.fixture
-def mock_tax_calculator():
+def mock_tax_calculator(monkeypatch):
     """Fixture providing a mocked TaxCalculator instance."""
-    with patch('app.core.worker.tax_calculator') as mock:
-        mock.fetch_tax_brackets.return_value = (
-            [{'max': 50000, 'min': 0, 'rate': 0.15}, {'min': 50000, 'rate': 0.205}],
-            True
-        )
-        mock.calculate_taxes.return_value = (7500.0, 15.0, [
-            {"tax_amount": 7500.00, "rate": 15, "bracket": "$0.00 to $50,000.00"}
-        ])
-        yield mock
+    mock = Mock()
+    mock.configure_mock(**{
+        "fetch_tax_brackets.return_value": tax_brackets(),
+        "calculate_taxes_batch.side_effect": lambda salaries, _: [calculated_taxes() for _ in salaries]
+    })
+    monkeypatch.setattr('app.core.worker.tax_calculator', mock)
+    return mock
 
-def test_get_base_response_default_year():
-    """Test get_base_response with default year."""
-    response = get_base_response()
-    assert response == {
+def tax_brackets():
+    """Build the brackets the mocked TaxCalculator fetches, shaped like the tax API response."""
+    return [{'max': 50000, 'min': 0, 'rate': 0.15}, {'min': 50000, 'rate': 0.205}], True
+
+def calculated_taxes():
+    """Build the result the mocked TaxCalculator computes for each salary."""
+    return 7500.0, 15.0, [{"tax_amount": 7500.00, "rate": 15, "bracket": "$0.00 to $50,000.00"}]
+
+def expected_base_response(year=DEFAULT_YEAR):
+    """Build the response expected for invalid or zero salary calculations."""
+    return {
         "salary": 0,
         "total_tax": 0,
         "effective_rate": 0,
         "taxes_per_bracket": [],
-        "year": DEFAULT_YEAR
+        "year": year
+    }
+
+def calculated_response(salary, year):
+    """Build the result the mocked TaxCalculator yields for a taxable salary."""
+    return {
+        "salary": salary,
+        "year": year,
+        "total_tax": 7500.0,
+        "effective_rate": 15.0,
+        "taxes_per_bracket": [{"tax_amount": 7500.00, "rate": 15, "bracket": "$0.00 to $50,000.00"}]
     }
 
+def test_get_base_response_default_year():
+    """Test get_base_response with default year."""
+    assert get_base_response() == expected_base_response()
+
 def test_get_base_response_custom_year():
     """Test get_base_response with custom year."""
-    response = get_base_response(2022)
-    assert response == {
-        "salary": 0,
-        "total_tax": 0,
-        "effective_rate": 0,
-        "taxes_per_bracket": [],
-        "year": 2022
-    }
+    assert get_base_response(2022) == expected_base_response(2022)
 
-def test_process_tax_calculations_valid_input():
-    """Test processing valid tax calculations."""
-    calculations = [
-        {"salary": 50000, "year": 2023}
-    ]
-    webhook_url = "https://example.com/webhook"
+@pytest.mark.parametrize("calculations,expected", [
+    ([{"salary": 50000, "year": 2023}], [calculated_response(50000, 2023)]),
+    ([{"salary": "invalid", "year": 2023}], [expected_base_response(2023)]),
+    ([{"salary": 0, "year": 2023}], [expected_base_response(2023)]),
+    ([{"salary": 50000, "year": "invalid"}], [calculated_response(50000, DEFAULT_YEAR)]),
+    ([{"salary": 50000}], [calculated_response(50000, DEFAULT_YEAR)]),
+    (["not a dictionary", {}, {"no_salary": 50000}], [expected_base_response() for _ in range(3)]),
+    (
+        [{"salary": 50000, "year": 2023}, {"salary": 75000, "year": 2022}],
+        [calculated_response(50000, 2023), calculated_response(75000, 2022)]
+    ),
+], ids=["valid_input", "invalid_salary", "zero_salary", "invalid_year", "missing_year", "invalid_calculation_format", "multiple_valid"])
+def test_process_tax_calculations(mock_tax_calculator, mock_send, webhook_url, calculations, expected):
+    """Test processing valid, invalid and malformed calculations."""
+    results = process_tax_calculations(calculations, webhook_url)
     
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 1
-        assert results[0]["salary"] == 50000
-        assert results[0]["year"] == 2023
-        assert results[0]["total_tax"] == 7500.0
-        assert results[0]["effective_rate"] == 15.0
-        assert len(results[0]["taxes_per_bracket"]) == 1
-        
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_invalid_salary():
-    """Test processing calculations with invalid salary."""
+    assert results == expected
+    assert mock_send.call_args_list == [call(webhook_url, results)]
+
+def test_process_tax_calculations_zero_salary_placeholders(monkeypatch, webhook_url):
+    """Test that placeholder zero salaries skip validation but keep their year."""
     calculations = [
-        {"salary": "invalid", "year": 2023}
+        {"salary": 0, "year": 2022},
+        {"salary": 0.0, "year": 2021},
+        {"salary": "0", "year": 2020},
+        {"salary": "", "year": 2019},
+        {"salary": None, "year": 2023}
     ]
-    webhook_url = "https://example.com/webhook"
+    mock_validate_salary = Mock()
+    monkeypatch.setattr('app.core.worker.validate_salary', mock_validate_salary)
     
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 1
-        assert results[0] == get_base_response(2023)
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_zero_salary():
-    """Test processing calculations with zero salary."""
-    calculations = [
-        {"salary": 0, "year": 2023}
-    ]
-    webhook_url = "https://example.com/webhook"
+    results = process_tax_calculations(calculations, webhook_url)
     
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 1
-        assert results[0] == get_base_response(2023)
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_invalid_year():
-    """Test processing calculations with invalid year."""
-    calculations = [
-        {"salary": 50000, "year": "invalid"}
-    ]
-    webhook_url = "https://example.com/webhook"
-    
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 1
-        assert results[0]["year"] == DEFAULT_YEAR
-        assert results[0]["salary"] == 50000
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_missing_year():
-    """Test processing calculations with missing year."""
+    assert results == [expected_base_response(year) for year in (2022, 2021, 2020, 2019, 2023)]
+    mock_validate_salary.assert_not_called()
+
+def test_process_tax_calculations_groups_by_year(mock_tax_calculator, mock_send, webhook_url):
+    """Test that brackets are fetched once per year and result order is preserved."""
     calculations = [
-        {"salary": 50000}
+        {"salary": 50000, "year": 2023},
+        {"salary": 0, "year": 2022},
+        {"salary": 75000, "year": 2022},
+        {"salary": 60000, "year": 2023}
     ]
-    webhook_url = "https://example.com/webhook"
     
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 1
-        assert results[0]["year"] == DEFAULT_YEAR
-        assert results[0]["salary"] == 50000
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_invalid_calculation_format():
-    """Test processing calculations with invalid format."""
-    calculations = [
-        "not a dictionary",
-        {},
-        {"no_salary": 50000}
-    ]
-    webhook_url = "https://example.com/webhook"
+    results = process_tax_calculations(calculations, webhook_url)
     
-    expected_response = get_base_response()
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 3
-        assert all(result == expected_response for result in results)
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_multiple_valid(mock_tax_calculator):
-    """Test processing multiple valid calculations."""
-    calculations = [
-        {"salary": 50000, "year": 2023},
-        {"salary": 75000, "year": 2022}
+    assert results == [
+        calculated_response(50000, 2023),
+        expected_base_response(2022),
+        calculated_response(75000, 2022),
+        calculated_response(60000, 2023)
     ]
-    webhook_url = "https://example.com/webhook"
+    assert mock_tax_calculator.fetch_tax_brackets.call_count == 2
+    assert mock_tax_calculator.calculate_taxes_batch.call_count == 2
+    assert mock_send.call_args_list == [call(webhook_url, results)]
+
+def test_fetch_tax_brackets_concurrently(mock_tax_calculator):
+    """Test that each year gets its own future and failures stay isolated to that year."""
+    def fetch_tax_brackets(year, _):
+        if year == 2022:
+            raise Exception("Fetch failed")
+        return [{'min': 0, 'rate': 0.1}], False
+    mock_tax_calculator.fetch_tax_brackets.side_effect = fetch_tax_brackets
     
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 2
-        assert all(result["total_tax"] == 7500.0 for result in results)
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_webhook_failure():
-    """Test handling webhook failure."""
-    calculations = [{"salary": 50000, "year": 2023}]
-    webhook_url = "https://example.com/webhook"
+    futures = fetch_tax_brackets_concurrently([2023, 2022])
     
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        mock_send.side_effect = requests.RequestException("Failed to send")
-        
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 1
-        assert results[0]["salary"] == 50000
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_process_tax_calculations_tax_calculation_error(mock_tax_calculator):
-    """Test handling tax calculation errors."""
+    assert futures[2023].result() == ([{'min': 0, 'rate': 0.1}], False)
+    with pytest.raises(Exception, match="Fetch failed"):
+        futures[2022].result()
+    assert fetch_tax_brackets_concurrently([]) == {}
+
+@pytest.mark.parametrize("target,exception,expected", [
+    ("send_results_to_webhook", requests.RequestException("Failed to send"), [calculated_response(50000, 2023)]),
+    ("tax_calculator.calculate_taxes_batch", Exception("Calculation failed"), [expected_base_response(2023)]),
+], ids=["webhook_failure", "tax_calculation_error"])
+def test_process_tax_calculations_errors(monkeypatch, mock_tax_calculator, mock_send, webhook_url, target, exception, expected):
+    """Test that webhook and tax calculation failures are logged rather than raised."""
     calculations = [{"salary": 50000, "year": 2023}]
-    webhook_url = "https://example.com/webhook"
+    monkeypatch.setattr(f'app.core.worker.{target}.side_effect', exception)
     
-    mock_tax_calculator.calculate_taxes.side_effect = Exception("Calculation failed")
+    results = process_tax_calculations(calculations, webhook_url)
     
-    with patch('app.core.worker.send_results_to_webhook') as mock_send:
-        results = process_tax_calculations(calculations, webhook_url)
-        
-        assert len(results) == 1
-        assert results[0] == get_base_response(2023)
-        mock_send.assert_called_once_with(webhook_url, results)
-
-def test_send_results_to_webhook():
+    assert results == expected
+    assert mock_send.call_args_list == [call(webhook_url, results)]
+
+def test_send_results_to_webhook(monkeypatch, webhook_url):
     """Test sending results to webhook."""
-    webhook_url = "https://example.com/webhook"
     results = [{"test": "data"}]
+    posts = []
+    def post(*args, **kwargs):
+        posts.append((args, kwargs))
+        return SimpleNamespace(status_code=200)
+    monkeypatch.setattr('requests.post', post)
+    
+    send_results_to_webhook(webhook_url, results)
     
-    with patch('requests.post') as mock_post:
-        mock_post.return_value.status_code = 200
-        from app.core.worker import send_results_to_webhook
-        
-        send_results_to_webhook(webhook_url, results)
-        
-        mock_post.assert_called_once_with(
-            webhook_url,
-            json={"results": results}
-        )
\ No newline at end of file
+    assert posts == [(
+        (webhook_url,),
+        {"data": orjson.dumps({"results": results}), "headers": {"Content-Type": "application/json"}}
+    )]